@@ -0,0 +1,28 @@
+"""Benchmarks of the bot, run from the repository root as modules, e.g.:
+
+    python -m benchmarks.schemas --number 200
+
+Most of them import the bot, so they need its environment (see envs/.env.example).
+"""
+import argparse
+import timeit
+from typing import Any, Callable
+
+
+def measure(func: Callable[[], Any], number: int, repeat: int) -> float:
+    # Best of the repeats, in microseconds per call
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def make_parser(doc: str) -> argparse.ArgumentParser:
+    # The first line of a benchmark's docstring says what it does
+    return argparse.ArgumentParser(description=doc.splitlines()[0])
+
+
+def parse_timing_args(
+    doc: str, number: int = 100, number_help: str = "calls per repeat"
+) -> argparse.Namespace:
+    parser = make_parser(doc)
+    parser.add_argument("--number", type=int, default=number, help=number_help)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
@@ -0,0 +1,86 @@
+"""Compare dispatch of callback queries by regexp filters and by the router.
+
+    python -m benchmarks.callback_routing --number 10000
+
+The callback goes to the last registered handler, which is the worst case of
+the regexp filters.
+"""
+import re
+from typing import List, Optional, Pattern
+
+from aiogram import Dispatcher
+
+from benchmarks import measure, parse_timing_args
+from bot.bot import bot  # type: ignore
+from bot.callback_forms import CallbackForm
+from bot.routing import CallbackRouter
+
+HANDLER_COUNTS = (10, 50, 200)
+
+CALLBACK_DATA = "buy_product:3:1024:7:5zCBhDNksws"
+
+BUY_REGEX = r"buy_product:(\d+):(\d+):(\d+):(.+|)"
+
+PARAM_HANDLERS = (int, int, int, None)
+
+
+async def handler(*args, **kwargs) -> None:
+    pass
+
+
+def make_patterns(handler_count: int) -> List[Pattern]:
+    patterns = [
+        re.compile(rf"extra_{index}:(\d+):(\d+):(\d+):(.+|)")
+        for index in range(handler_count - 1)
+    ]
+    return [*patterns, re.compile(BUY_REGEX)]
+
+
+def dispatch_by_regexps(patterns: List[Pattern]) -> Optional[list]:
+    # What aiogram's Regexp filters and ``handle_regex_params`` do
+    for pattern in patterns:
+        match = pattern.search(CALLBACK_DATA)
+        if match:
+            return [
+                param_handler(value) if param_handler is not None else value
+                for param_handler, value in zip(PARAM_HANDLERS, match.groups())
+            ]
+    return None
+
+
+def make_router(handler_count: int) -> CallbackRouter:
+    router = CallbackRouter(Dispatcher(bot))
+    for index in range(handler_count - 1):
+        router.add_route(CallbackForm(f"extra_{index}"), handler, *PARAM_HANDLERS)
+    router.add_route(CallbackForm("buy_product"), handler, *PARAM_HANDLERS)
+    return router
+
+
+def dispatch_by_router(router: CallbackRouter) -> Optional[list]:
+    # Parameters are handled the same way, without awaiting them
+    route, values = router.match(CALLBACK_DATA)  # type: ignore
+    return [
+        param_handler(value) if param_handler is not None else value
+        for param_handler, value in zip(route.param_handlers, values)
+    ]
+
+
+def main() -> None:
+    args = parse_timing_args(__doc__, number=5000)
+    print(f"{'handlers':>8} {'regexps, us':>12} {'router, us':>11}")
+    for handler_count in HANDLER_COUNTS:
+        patterns = make_patterns(handler_count)
+        router = make_router(handler_count)
+        assert dispatch_by_regexps(patterns) == dispatch_by_router(router)
+
+        regexps_time = measure(
+            lambda: dispatch_by_regexps(patterns), args.number, args.repeat
+        )
+        router_time = measure(
+            lambda: dispatch_by_router(router), args.number, args.repeat
+        )
+        print(f"{handler_count:>8} {regexps_time:>12.2f} {router_time:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
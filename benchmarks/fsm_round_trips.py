@@ -0,0 +1,66 @@
+"""Count FSM storage round trips of a filter choice click, with units of work or not.
+
+    python -m benchmarks.fsm_round_trips
+
+Needs the bot's Redis. The storage calls are the ones the handlers make: the
+router's state check, `state.proxy()` of `process_filter_choice`,
+`ProductFiltersForm.next()` and `_answer_product_filter` of a dependent filter.
+"""
+import asyncio
+
+from aiogram.dispatcher import FSMContext
+
+from bot.bot import dp, settings  # type: ignore
+from bot.states import ProductFiltersForm
+from bot.storage import UnitOfWork
+from bot.storage.unit_of_work import current_unit_of_work
+
+CHAT = USER = -1
+
+
+async def click_filter_choice(state: FSMContext) -> None:
+    await state.get_state()
+    async with state.proxy() as generic_data:
+        generic_data.setdefault(settings.FILTERS_STORAGE_KEY, {})
+        generic_data[settings.FILTERS_STORAGE_KEY]["gender"] = "1"
+    await state.set_state(ProductFiltersForm.category)
+    await state.get_state()
+    await state.get_data()
+
+
+async def count_round_trips(unit_of_work: bool) -> int:
+    storage = dp.storage
+    state = FSMContext(storage, chat=CHAT, user=USER)
+    await state.set_state(ProductFiltersForm.gender)
+
+    round_trips = storage.round_trips
+    if unit_of_work:
+        current_unit = UnitOfWork()
+        current_unit_of_work.set(current_unit)
+        await click_filter_choice(state)
+        await storage.save_unit_of_work(current_unit)
+        current_unit_of_work.set(None)
+    else:
+        await click_filter_choice(state)
+    round_trips = storage.round_trips - round_trips
+
+    await state.reset_state()
+    return round_trips
+
+
+async def run() -> None:
+    print(f"{'unit of work':>12} {'round trips':>12}")
+    for unit_of_work in (False, True):
+        round_trips = await count_round_trips(unit_of_work)
+        print(f"{str(unit_of_work):>12} {round_trips:>12}")
+
+    await dp.storage.close()
+    await dp.storage.wait_closed()
+
+
+def main() -> None:
+    asyncio.get_event_loop().run_until_complete(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compare the JSON codecs on /shoes/ payloads of the stand-in API.
+
+    python -m benchmarks.json_codecs --number 200
+"""
+from typing import Any, List
+
+from benchmarks import measure, parse_timing_args
+from bot.json_codec import JsonCodec, get_json_codec
+from fake_api.catalog import make_catalog, make_page
+
+PAGE_SIZES = (10, 50, 200)
+
+CODEC_NAMES = ("json", "orjson")
+
+
+def bench_codec(codec: JsonCodec, page: Any, number: int, repeat: int) -> List[float]:
+    raw_page = codec.dumps_bytes(page)
+    return [
+        measure(lambda: codec.loads(raw_page.decode()), number, repeat),
+        measure(lambda: codec.dumps_bytes(page), number, repeat),
+    ]
+
+
+def main() -> None:
+    args = parse_timing_args(__doc__)
+    codecs = [get_json_codec(name) for name in CODEC_NAMES]
+    if codecs[-1].name != "orjson":
+        print("orjson isn't installed, only stdlib json is measured.")
+        codecs = codecs[:1]
+
+    print(f"{'items':>6} {'bytes':>8} {'codec':>7} {'loads, us':>10} {'dumps, us':>10}")
+    for page_size in PAGE_SIZES:
+        catalog = make_catalog(page_size)
+        page = make_page(catalog.products, page=1, page_size=page_size)
+        size = len(codecs[0].dumps_bytes(page))
+        for codec in codecs:
+            loads_time, dumps_time = bench_codec(codec, page, args.number, args.repeat)
+            print(
+                f"{page_size:>6} {size:>8} {codec.name:>7}"
+                f" {loads_time:>10.1f} {dumps_time:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
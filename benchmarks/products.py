@@ -0,0 +1,61 @@
+"""Measure the memory a catalog of products takes once it's loaded.
+
+    python -m benchmarks.products --products 10000 50000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, List
+
+from benchmarks import make_parser
+from bot.schemas import ProductSchema, load_with_fast_path
+from fake_api.catalog import make_catalog, public_product
+
+
+def measure_retained(load: Callable[[], Any]) -> int:
+    # Only what's still referenced by the loaded value counts
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = load()
+        gc.collect()
+        retained, __ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del value
+    return retained
+
+
+def bench_catalog(products_number: int) -> List[float]:
+    catalog = make_catalog(products_number)
+    dump = json.dumps([public_product(product) for product in catalog.products])
+
+    def load_products() -> Any:
+        return [
+            load_with_fast_path(ProductSchema, raw_product)
+            for raw_product in json.loads(dump)
+        ]
+
+    return [
+        measure_retained(lambda: json.loads(dump)) / products_number,
+        measure_retained(load_products) / products_number,
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = make_parser(__doc__)
+    parser.add_argument("--products", type=int, nargs="+", default=[10000, 50000])
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"{'products':>9} {'raw dicts, B':>14} {'products, B':>14}")
+    for products_number in args.products:
+        raw_size, products_size = bench_catalog(products_number)
+        print(f"{products_number:>9} {raw_size:>14.0f} {products_size:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
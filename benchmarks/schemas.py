@@ -0,0 +1,50 @@
+"""Compare the compiled product page loader with the marshmallow schema.
+
+    python -m benchmarks.schemas --number 200
+"""
+from typing import Any, Dict, List
+
+from benchmarks import measure, parse_timing_args
+from bot.schemas import ProductPageSchema, ProductSchema, compile_loader
+from fake_api.catalog import make_catalog, make_page
+
+PAGE_SIZES = (10, 50, 200)
+
+
+def make_raw_page(page_size: int) -> Dict[str, Any]:
+    catalog = make_catalog(page_size)
+    raw_page = make_page(catalog.products, page=1, page_size=page_size)
+    assert raw_page is not None
+    return raw_page
+
+
+def bench_page(page_size: int, number: int, repeat: int) -> List[float]:
+    raw_page = make_raw_page(page_size)
+    page_schema, products_schema = ProductPageSchema(), ProductSchema(many=True)
+    load_fast = compile_loader(ProductPageSchema)
+
+    def load_with_schema() -> Any:
+        # What the page schema did before its results became lazy
+        page = page_schema.load(raw_page)
+        return page, products_schema.load(raw_page["results"])
+
+    assert list(load_fast(raw_page).results) == load_with_schema()[1]
+    return [
+        measure(load_with_schema, number, repeat),
+        measure(lambda: list(load_fast(raw_page).results), number, repeat),
+        # A slide only needs one product of the page
+        measure(lambda: load_fast(raw_page)[0], number, repeat),
+    ]
+
+
+def main() -> None:
+    args = parse_timing_args(__doc__, number_help="loads per repeat")
+    columns = ["schema", "compiled", "one slide"]
+    print(f"{'items':>6}", *(f"{f'{column}, us':>14}" for column in columns))
+    for page_size in PAGE_SIZES:
+        times = bench_page(page_size, args.number, args.repeat)
+        print(f"{page_size:>6}", *(f"{time:>14.1f}" for time in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,22 @@
+import asyncio
+
 from aiogram import Dispatcher, executor
 
 from .bot import _, bot, dp, settings  # type: ignore
+from .caching import close_redis, get_redis
 from .client import Client
+from .startup import startup_timer
 from .utils import message_admins, tz_aware_now
+from .warmup import warm_up
 
 
 async def on_startup(dispatcher: Dispatcher) -> None:
+    with startup_timer.stage("redis connect"):
+        await asyncio.gather(dispatcher.storage.redis(), get_redis())
+    with startup_timer.stage("warm-up"):
+        await warm_up()
+    startup_timer.log_report()
+
     now = tz_aware_now().strftime(settings.DATETIME_FORMAT)
     await message_admins(
         lambda admin_id: bot.send_message(
@@ -15,8 +26,8 @@ async def on_startup(dispatcher: Dispatcher) -> None:
 
 
 async def on_shutdown(dispatcher: Dispatcher) -> None:
-    client = Client.get_client()
-    await client.close()
+    await Client.close_all()
+    await close_redis()
     await dispatcher.storage.close()
     await dispatcher.storage.wait_closed()
     now = tz_aware_now().strftime(settings.DATETIME_FORMAT)
@@ -30,6 +41,8 @@ async def on_shutdown(dispatcher: Dispatcher) -> None:
 if __name__ == "__main__":
     from . import handlers  # noqa
 
+    startup_timer.record_since_start("imports")
+
     executor.start_polling(
         dp, skip_updates=True, on_startup=on_startup, on_shutdown=on_shutdown
     )
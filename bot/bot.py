@@ -5,11 +5,14 @@ import logging.config
 
 import aiohttp
 from aiogram import Bot, Dispatcher
-from aiogram.contrib.fsm_storage.redis import RedisStorage2
-from aiogram.contrib.middlewares.i18n import I18nMiddleware
 from babel.support import LazyProxy
 from environs import Env
 
+from .i18n import EmojiI18nMiddleware
+from .json_codec import get_json_codec
+from .startup import startup_timer
+from .storage import Serializer, SerializingRedisStorage, UnitOfWorkMiddleware
+
 env = Env()
 
 settings_name = env("BOT_SETTINGS_MODULE", "bot.settings.production")
@@ -20,12 +23,29 @@ logging.config.dictConfig(settings.LOGGING)
 
 bot = Bot(settings.BOT_TOKEN)
 
-dp = Dispatcher(bot, storage=RedisStorage2(**settings.FSM_STORAGE))
+json_codec = get_json_codec(settings.JSON_CODEC)
+
+serializer = Serializer(**settings.STORAGE_SERIALIZER, json_codec=json_codec)
 
-i18n = I18nMiddleware(settings.I18N_DOMAIN, settings.LOCALES_DIR)
+dp = Dispatcher(
+    bot,
+    storage=SerializingRedisStorage(
+        **settings.FSM_STORAGE,
+        serializer=serializer,
+        local_cache=settings.FSM_LOCAL_CACHE,
+        max_data_bytes=settings.FSM_DATA_MAX_BYTES,
+        expendable_data_keys=[settings.CACHED_PAGE_STORAGE_KEY],
+    ),
+)
+
+with startup_timer.stage("i18n load"):
+    i18n = EmojiI18nMiddleware(settings.I18N_DOMAIN, settings.LOCALES_DIR)
 
 dp.middleware.setup(i18n)
 
+if settings.FSM_UNIT_OF_WORK:
+    dp.middleware.setup(UnitOfWorkMiddleware())
+
 _ = i18n.gettext
 
 
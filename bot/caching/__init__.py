@@ -0,0 +1,13 @@
+# flake8: noqa
+from .conditional import (
+    NOT_MODIFIED,
+    ConditionalResponse,
+    Validators,
+    extract_validators,
+    make_conditional_headers,
+)
+from .lru import LRUCache
+from .pages import CachedPage, SharedPageCache
+from .redis import REDIS_ERRORS, close_redis, get_redis, make_key
+from .single_flight import SingleFlight
+from .swr import StaleWhileRevalidateCache
@@ -0,0 +1,29 @@
+from typing import Any, Dict, Mapping, NamedTuple
+
+# Response headers to revalidate a cached response with
+VALIDATOR_HEADERS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+
+Validators = Dict[str, str]
+
+NOT_MODIFIED = object()
+
+
+class ConditionalResponse(NamedTuple):
+    data: Any
+    validators: Validators
+
+    @property
+    def not_modified(self) -> bool:
+        return self.data is NOT_MODIFIED
+
+
+def extract_validators(headers: Mapping[str, str]) -> Validators:
+    return {name: headers[name] for name in VALIDATOR_HEADERS if name in headers}
+
+
+def make_conditional_headers(validators: Validators) -> Dict[str, str]:
+    return {
+        VALIDATOR_HEADERS[name]: value
+        for name, value in validators.items()
+        if name in VALIDATOR_HEADERS
+    }
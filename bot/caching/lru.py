@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, NamedTuple, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Entry(NamedTuple):
+    value: object
+    weight: int
+    stored_at: float
+
+
+class LRUCache(Generic[T]):
+    """Process-local LRU cache bounded by the total weight of its entries.
+
+    The weight of an entry is up to the caller, e.g. its size in bytes. Entries
+    older than ``ttl`` seconds (if it's given) are treated as missing.
+    """
+
+    def __init__(self, name: str, *, max_weight: int, ttl: Optional[float] = None):
+        self.name = name
+        self.max_weight = max_weight
+        self.ttl = ttl
+        self.weight = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def __repr__(self) -> str:
+        class_name = type(self).__name__
+        return (
+            f"{class_name}({self.name}, entries={len(self)}, weight={self.weight}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._is_expired(entry)
+
+    def get(self, key: Hashable) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None or self._is_expired(entry):
+            self.misses += 1
+            if entry is not None:
+                self.invalidate(key)
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.value  # type: ignore
+
+    def set(
+        self,
+        key: Hashable,
+        value: T,
+        weight: int = 1,
+        stored_at: Optional[float] = None,
+    ) -> None:
+        # An older value must not outlive the one that isn't cached
+        self.invalidate(key)
+        if weight > self.max_weight:
+            return
+
+        if stored_at is None:
+            stored_at = time.monotonic()
+        self._entries[key] = _Entry(value, weight, stored_at)
+        self.weight += weight
+        while self.weight > self.max_weight:
+            __, evicted = self._entries.popitem(last=False)
+            self.weight -= evicted.weight
+            self.evictions += 1
+
+    def replace(self, key: Hashable, value: T, weight: int = 1) -> None:
+        """Replace the value of a cached entry, which expires when the old one would."""
+        entry = self._entries.get(key)
+        if entry is None or self._is_expired(entry):
+            self.invalidate(key)
+            return
+        self.set(key, value, weight, stored_at=entry.stored_at)
+
+    def invalidate(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= entry.weight
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.weight = 0
+
+    def _is_expired(self, entry: _Entry) -> bool:
+        return self.ttl is not None and time.monotonic() - entry.stored_at >= self.ttl
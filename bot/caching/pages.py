@@ -0,0 +1,193 @@
+import logging
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from ..storage import Serializer
+from .conditional import Validators
+from .redis import REDIS_ERRORS, get_redis, make_key
+
+logger = logging.getLogger(__name__)
+
+RawPage = Dict[str, Any]
+
+# Sets page sizes, removing the zero ones, and keeps their running total
+RESIZE_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    local size = tonumber(ARGV[i + 1])
+    local delta = size - tonumber(redis.call("HGET", KEYS[1], ARGV[i]) or 0)
+    if size > 0 then
+        redis.call("HSET", KEYS[1], ARGV[i], size)
+    else
+        redis.call("HDEL", KEYS[1], ARGV[i])
+    end
+    redis.call("INCRBY", KEYS[2], delta)
+end
+return tonumber(redis.call("GET", KEYS[2]) or 0)
+"""
+
+
+class CachedPage(NamedTuple):
+    page: RawPage
+    validators: Validators
+    size: int
+    stored_at: float
+    is_fresh: bool
+
+
+class SharedPageCache:
+    """Product pages shared by all users, keyed by locale and canonical filters.
+
+    Pages are fresh for ``ttl`` seconds and kept for ``max_stale`` more seconds
+    to be revalidated or served when the API is unavailable. Every stored page
+    is accounted in a sizes hash, with a running total of them, and an index
+    sorted by the storing time, the oldest pages are evicted once ``max_bytes``
+    is exceeded. The index also
+    keeps the pages freshness, so revalidated pages are touched without being
+    transferred again.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl: int,
+        max_stale: int,
+        max_bytes: int,
+        max_page_bytes: int,
+        serializer: Serializer,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_bytes = max_bytes
+        self.max_page_bytes = max_page_bytes
+        self.serializer = serializer
+        self._index_key = make_key(namespace, "index")
+        self._sizes_key = make_key(namespace, "sizes")
+        self._total_size_key = make_key(namespace, "total_size")
+        self.hits = self.misses = 0
+
+    def __repr__(self) -> str:
+        class_name = type(self).__name__
+        return f"{class_name}({self.namespace}, hits={self.hits}, misses={self.misses})"
+
+    def make_page_key(self, locale: str, canonical_query: str) -> str:
+        return f"{locale}:{canonical_query}"
+
+    async def get(self, page_key: str) -> Optional[CachedPage]:
+        try:
+            redis = await get_redis()
+            transaction = redis.multi_exec()
+            raw_page = transaction.get(self._make_value_key(page_key))
+            stored_at = transaction.zscore(self._index_key, page_key)
+            await transaction.execute()
+            raw_page, stored_at = raw_page.result(), stored_at.result()
+        except REDIS_ERRORS:
+            logger.warning("Shared page cache is unavailable.", exc_info=True)
+            raw_page = stored_at = None
+
+        if raw_page is None:
+            self.misses += 1
+            return None
+
+        # A page which dropped out of the index can only be revalidated
+        stored_at = stored_at or 0.0
+        page, validators = self.serializer.loads(raw_page)
+        is_fresh = time.time() - stored_at < self.ttl
+        if is_fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return CachedPage(page, validators, len(raw_page), stored_at, is_fresh)
+
+    async def set(
+        self, page_key: str, page: RawPage, validators: Optional[Validators] = None
+    ) -> int:
+        # Returns the size of the encoded page
+        raw_page = self.serializer.dumps([page, validators or {}])
+        size = len(raw_page)
+        if size > self.max_page_bytes:
+            logger.warning("Page '%s' of %s bytes is too big to cache.", page_key, size)
+            return size
+
+        try:
+            redis = await get_redis()
+            transaction = redis.multi_exec()
+            transaction.set(
+                self._make_value_key(page_key),
+                raw_page,
+                expire=self.ttl + self.max_stale,
+            )
+            transaction.zadd(self._index_key, time.time(), page_key)
+            total_size = self._resize(transaction, {page_key: size})
+            self._expire_accounting(transaction)
+            await transaction.execute()
+            await self._enforce_limits(redis, total_size.result())
+        except REDIS_ERRORS:
+            logger.warning("Shared page cache is unavailable.", exc_info=True)
+        return size
+
+    async def touch(self, page_key: str, cached_page: CachedPage) -> None:
+        try:
+            redis = await get_redis()
+            transaction = redis.multi_exec()
+            transaction.expire(
+                self._make_value_key(page_key), self.ttl + self.max_stale
+            )
+            transaction.zadd(self._index_key, time.time(), page_key)
+            self._resize(transaction, {page_key: cached_page.size})
+            self._expire_accounting(transaction)
+            await transaction.execute()
+        except REDIS_ERRORS:
+            logger.warning("Shared page cache is unavailable.", exc_info=True)
+
+    async def get_usage(self) -> Tuple[int, int]:
+        redis = await get_redis()
+        transaction = redis.multi_exec()
+        entries = transaction.hlen(self._sizes_key)
+        total_size = transaction.get(self._total_size_key)
+        await transaction.execute()
+        return entries.result(), int(total_size.result() or 0)
+
+    def _make_value_key(self, page_key: str) -> str:
+        return make_key(self.namespace, "page", page_key)
+
+    def _expire_accounting(self, transaction: Any) -> None:
+        # Expires with the newest page, so Redis evicts it after the pages, and
+        # drops it once the cache is no longer used
+        for key in (self._index_key, self._sizes_key, self._total_size_key):
+            transaction.expire(key, self.ttl + self.max_stale)
+
+    def _resize(self, transaction: Any, sizes: Dict[str, int]) -> Any:
+        # Returns the future of the new total size
+        args = [arg for page_key, size in sizes.items() for arg in (page_key, size)]
+        return transaction.eval(
+            RESIZE_SCRIPT, keys=[self._sizes_key, self._total_size_key], args=args
+        )
+
+    async def _enforce_limits(self, redis: Any, total_size: int) -> None:
+        # Forget pages Redis has already expired
+        expired = await redis.zrangebyscore(
+            self._index_key,
+            max=time.time() - self.ttl - self.max_stale,
+            encoding="utf-8",
+        )
+        if expired:
+            total_size = await self._forget(redis, expired, delete=False)
+
+        while total_size > self.max_bytes:
+            oldest = await redis.zrange(self._index_key, 0, 0, encoding="utf-8")
+            if not oldest:
+                break
+            total_size = await self._forget(redis, oldest)
+
+    async def _forget(self, redis: Any, page_keys: Any, delete: bool = True) -> int:
+        # Returns the total size of the pages left
+        transaction = redis.multi_exec()
+        transaction.zrem(self._index_key, *page_keys)
+        total_size = self._resize(transaction, dict.fromkeys(page_keys, 0))
+        if delete:
+            transaction.delete(*map(self._make_value_key, page_keys))
+        await transaction.execute()
+        logger.debug("Forgot cached pages: %s", page_keys)
+        return total_size.result()
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Optional
+
+import aioredis
+
+from ..bot import settings  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Errors of the shared cache tier must never break a handler
+REDIS_ERRORS = (aioredis.RedisError, OSError, asyncio.TimeoutError)
+
+# Caches live in the same Redis container as the FSM storage,
+# but use their own connection pool and key prefix
+_redis: Optional[aioredis.Redis] = None
+_lock: Optional[asyncio.Lock] = None
+
+
+async def get_redis() -> aioredis.Redis:
+    global _redis, _lock
+    if _lock is None:
+        _lock = asyncio.Lock()
+
+    async with _lock:
+        if _redis is None or _redis.closed:
+            _redis = await aioredis.create_redis_pool(
+                (settings.FSM_STORAGE["host"], settings.FSM_STORAGE["port"]),
+                **settings.CACHE_REDIS_POOL,
+            )
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None and not _redis.closed:
+        _redis.close()
+        await _redis.wait_closed()
+    _redis = None
+
+
+def make_key(*parts: str) -> str:
+    return ":".join([settings.CACHE_KEY_PREFIX, *parts])
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+from ..bot import json_codec  # type: ignore
+from .conditional import ConditionalResponse, Validators
+from .redis import REDIS_ERRORS, get_redis, make_key
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Gets the validators of the cached value (empty if there is none), so it can
+# answer that the value is not modified instead of loading it again
+Loader = Callable[[Validators], Awaitable[ConditionalResponse]]
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    fetched_at: float
+    validators: Validators
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class StaleWhileRevalidateCache:
+    """Two-tier (process memory + Redis) cache with refresh-ahead.
+
+    Entries younger than ``ttl - refresh_ahead`` are served as is. Older ones are
+    still served, but a background refresh is scheduled. Only entries older than
+    ``ttl + max_stale`` (or missing ones) are loaded on the caller's path.
+    """
+
+    LOCK_TIMEOUT = 30
+
+    def __init__(
+        self, namespace: str, *, ttl: int, refresh_ahead: int, max_stale: int
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_stale = max_stale
+        self._local: Dict[str, CacheEntry] = {}
+        self._refreshes: Dict[str, asyncio.Future] = {}
+        self._loads = SingleFlight()
+        self.hits = self.stale_hits = self.misses = self.revalidations = 0
+
+    def __repr__(self) -> str:
+        class_name = type(self).__name__
+        return (
+            f"{class_name}({self.namespace}, hits={self.hits}, "
+            f"stale_hits={self.stale_hits}, misses={self.misses}, "
+            f"revalidations={self.revalidations})"
+        )
+
+    async def get(self, key: str, loader: Loader) -> Any:
+        entry = self._local.get(key)
+        if entry is None or entry.age >= self.ttl - self.refresh_ahead:
+            # Another replica could've already refreshed the shared entry
+            shared_entry = await self._get_shared(key)
+            if shared_entry is not None and (
+                entry is None or shared_entry.fetched_at > entry.fetched_at
+            ):
+                entry = self._local[key] = shared_entry
+
+        if entry is None or entry.age >= self.ttl + self.max_stale:
+            self.misses += 1
+            try:
+                # Concurrent misses of the key wait for the same load
+                entry = await self._loads.do(
+                    key, partial(self._load, key, loader, entry)
+                )
+            except Exception:
+                # The last known value is better than no value at all
+                if entry is None:
+                    raise
+                logger.warning("Serving expired '%s' entry.", key, exc_info=True)
+        elif entry.age >= self.ttl - self.refresh_ahead:
+            self.stale_hits += 1
+            self._schedule_refresh(key, loader, entry)
+        else:
+            self.hits += 1
+
+        return entry.value
+
+    def invalidate(self, key: str) -> None:
+        self._local.pop(key, None)
+
+    def _schedule_refresh(self, key: str, loader: Loader, entry: CacheEntry) -> None:
+        if key in self._refreshes:
+            return
+
+        future = asyncio.ensure_future(self._refresh(key, loader, entry))
+        self._refreshes[key] = future
+        future.add_done_callback(lambda __: self._refreshes.pop(key, None))
+
+    async def _refresh(self, key: str, loader: Loader, entry: CacheEntry) -> None:
+        # Only one replica refreshes the entry, others keep serving the stale one
+        if not await self._acquire_refresh_lock(key):
+            return
+
+        try:
+            await self._load(key, loader, entry)
+        except Exception:
+            logger.exception("Unable to refresh '%s' cache entry.", key)
+
+    async def _load(
+        self, key: str, loader: Loader, entry: Optional[CacheEntry]
+    ) -> CacheEntry:
+        response = await loader(entry.validators if entry is not None else {})
+        if response.not_modified and entry is not None:
+            self.revalidations += 1
+            entry = CacheEntry(entry.value, time.time(), response.validators)
+            await self._touch_shared(key, entry)
+        else:
+            entry = CacheEntry(response.data, time.time(), response.validators)
+            await self._set_shared(key, entry)
+
+        self._local[key] = entry
+        return entry
+
+    def _make_shared_key(self, key: str, *suffix: str) -> str:
+        return make_key(self.namespace, key, *suffix)
+
+    # The fetching time is kept apart from the value, so revalidated
+    # entries are refreshed without transferring the value again
+    async def _get_shared(self, key: str) -> Optional[CacheEntry]:
+        try:
+            redis = await get_redis()
+            raw_entry, fetched_at = await redis.mget(
+                self._make_shared_key(key), self._make_shared_key(key, "fetched_at")
+            )
+        except REDIS_ERRORS:
+            logger.warning("Shared cache is unavailable.", exc_info=True)
+            return None
+
+        if raw_entry is None or fetched_at is None:
+            return None
+        value, validators = json_codec.loads(raw_entry)
+        return CacheEntry(value, float(fetched_at), validators)
+
+    async def _set_shared(self, key: str, entry: CacheEntry) -> None:
+        try:
+            redis = await get_redis()
+            transaction = redis.multi_exec()
+            transaction.set(
+                self._make_shared_key(key),
+                json_codec.dumps([entry.value, entry.validators]),
+                expire=self.ttl + self.max_stale,
+            )
+            transaction.set(
+                self._make_shared_key(key, "fetched_at"),
+                str(entry.fetched_at),
+                expire=self.ttl + self.max_stale,
+            )
+            await transaction.execute()
+        except REDIS_ERRORS:
+            logger.warning("Shared cache is unavailable.", exc_info=True)
+
+    async def _touch_shared(self, key: str, entry: CacheEntry) -> None:
+        try:
+            redis = await get_redis()
+            transaction = redis.multi_exec()
+            transaction.expire(self._make_shared_key(key), self.ttl + self.max_stale)
+            transaction.set(
+                self._make_shared_key(key, "fetched_at"),
+                str(entry.fetched_at),
+                expire=self.ttl + self.max_stale,
+            )
+            await transaction.execute()
+        except REDIS_ERRORS:
+            logger.warning("Shared cache is unavailable.", exc_info=True)
+
+    async def _acquire_refresh_lock(self, key: str) -> bool:
+        try:
+            redis = await get_redis()
+            return bool(
+                await redis.set(
+                    self._make_shared_key(key, "lock"),
+                    "1",
+                    expire=self.LOCK_TIMEOUT,
+                    exist=redis.SET_IF_NOT_EXIST,
+                )
+            )
+        except REDIS_ERRORS:
+            logger.warning("Shared cache is unavailable.", exc_info=True)
+            return True
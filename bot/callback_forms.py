@@ -26,6 +26,10 @@ class CallbackForm:
     def callback_string(self) -> str:
         return self.DELIMITER.join(self.parts)
 
+    def make_callback_string(self, *parts: str) -> str:
+        # Same as extending the form with the parts, without the forms in between
+        return self.DELIMITER.join([*self.parts, *parts])
+
 
 _filter_choices = CallbackForm("filter")
 
@@ -47,4 +51,6 @@ DELETE = _bookmarks.extend("delete")
 
 LIST_SIZES = CallbackForm("list_sizes")
 
+# Buttons sent before products were pinned by their ids
 BUY = CallbackForm("buy")
+BUY_PRODUCT = CallbackForm("buy_product")
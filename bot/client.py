@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Any, Dict, Sequence
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import aiohttp
-from aiogram.types import User
-from async_lru import alru_cache
 from furl import furl
 
-from .bot import settings  # type: ignore
+from .bot import json_codec, settings  # type: ignore
+from .caching import (
+    NOT_MODIFIED,
+    ConditionalResponse,
+    SingleFlight,
+    Validators,
+    extract_validators,
+    make_conditional_headers,
+)
+from .resilience import CircuitBreaker, CircuitBreakerOpen, retry
+from .utils import get_current_locale
 
 if TYPE_CHECKING:
     from .product_filters import ProductFilters
@@ -16,35 +26,157 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class UnexpectedResponse(Exception):
+    pass
+
+
+RETRY_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+API_ERRORS = (*RETRY_ERRORS, CircuitBreakerOpen, UnexpectedResponse)
+
+
 class Client:
-    _client = None
+    _clients: Dict[str, Client] = {}
+    _connector: Optional[aiohttp.TCPConnector] = None
+    # Endpoint health doesn't depend on the locale, so breakers are shared
+    _breakers: Dict[str, CircuitBreaker] = {}
 
-    def __init__(self) -> None:
+    def __init__(self, locale: str) -> None:
+        self.locale = locale
         headers = {
             "Authorization": f"Token {settings.API_TOKEN}",
-            "Accept-Language": User.get_current().locale.language,
+            "Accept-Language": locale,
         }
-        self._session = aiohttp.ClientSession(headers=headers)
+        # All the locale sessions share one connector, so warm connections
+        # are reused regardless of the user language
+        self._session = aiohttp.ClientSession(
+            connector=self.get_connector(),
+            connector_owner=False,
+            headers=headers,
+            timeout=self._get_timeout("default"),
+            json_serialize=json_codec.dumps,
+        )
         self._api_base = furl(settings.API_BASE_URL)
+        self._product_page_requests = SingleFlight()
 
     @classmethod
-    def get_client(cls) -> Client:
-        if cls._client is None:
-            cls._client = cls()
-        return cls._client
+    def get_connector(cls) -> aiohttp.TCPConnector:
+        if cls._connector is None or cls._connector.closed:
+            cls._connector = aiohttp.TCPConnector(**settings.API_CONNECTOR)
+        return cls._connector
+
+    @classmethod
+    def get_client(cls, locale: Optional[str] = None) -> Client:
+        locale = get_current_locale(locale)
+        client = cls._clients.get(locale)
+        if client is None:
+            logger.debug("Creating API client for '%s' locale.", locale)
+            client = cls._clients[locale] = cls(locale)
+        return client
+
+    @classmethod
+    async def close_all(cls) -> None:
+        for client in cls._clients.values():
+            await client.close()
+        cls._clients.clear()
+
+        if cls._connector is not None:
+            await cls._connector.close()
+            cls._connector = None
 
     async def close(self):
         await self._session.close()
 
-    @alru_cache
-    async def fetch_filter_choices(self, route: str) -> Sequence[Dict[str, Any]]:
+    @classmethod
+    def get_breaker(cls, route: str) -> CircuitBreaker:
+        breaker = cls._breakers.get(route)
+        if breaker is None:
+            breaker = cls._breakers[route] = CircuitBreaker(
+                route, **settings.API_CIRCUIT_BREAKER
+            )
+        return breaker
+
+    @staticmethod
+    def _get_timeout(endpoint: str) -> aiohttp.ClientTimeout:
+        timeouts = settings.API_TIMEOUTS
+        return aiohttp.ClientTimeout(**timeouts.get(endpoint, timeouts["default"]))
+
+    async def _get_json(
+        self,
+        route: str,
+        url: str,
+        timeout_name: str,
+        validators: Optional[Validators] = None,
+    ) -> ConditionalResponse:
+        # With validators of a cached response, a not modified response
+        # is neither transferred nor deserialized
+        breaker = self.get_breaker(route)
+        headers = make_conditional_headers(validators or {})
+
+        async def request() -> ConditionalResponse:
+            breaker.check()
+            try:
+                async with self._session.get(
+                    url,
+                    headers=headers,
+                    allow_redirects=False,
+                    timeout=self._get_timeout(timeout_name),
+                ) as response:
+                    # Client errors are answers, not a sign of the API failure
+                    if response.status >= 500:
+                        response.raise_for_status()
+
+                    if response.status == 304:
+                        data = NOT_MODIFIED
+                        response_validators = validators or {}
+                    else:
+                        data = await self._read_json(response)
+                        response_validators = extract_validators(response.headers)
+            except RETRY_ERRORS:
+                breaker.record_failure()
+                raise
+            except UnexpectedResponse:
+                # The API has answered, so it's neither retried nor a failure
+                breaker.record_success()
+                raise
+            breaker.record_success()
+            return ConditionalResponse(data, response_validators)
+
+        return await retry(request, retry_on=RETRY_ERRORS, **settings.API_RETRY)
+
+    @staticmethod
+    async def _read_json(response: aiohttp.ClientResponse) -> Any:
+        # E.g. a client error page of a proxy, ContentTypeError is a ClientError
+        try:
+            return await response.json(loads=json_codec.loads)
+        except (aiohttp.ContentTypeError, ValueError) as e:
+            raise UnexpectedResponse(
+                f"{response.status} response of {response.url} isn't JSON."
+            ) from e
+
+    async def fetch_filter_choices(
+        self, route: str, validators: Optional[Validators] = None
+    ) -> ConditionalResponse:
         url = self._api_base.copy().add(path=route).url
-        async with self._session.get(url, allow_redirects=False) as response:
-            return await response.json()
+        return await self._get_json(route, url, "filter_choices", validators)
 
     async def fetch_product_page(
-        self, product_filters: ProductFilters
-    ) -> Dict[str, Any]:
+        self, product_filters: ProductFilters, validators: Optional[Validators] = None
+    ) -> ConditionalResponse:
+        # Identical concurrent requests (e.g. everyone browsing without filters
+        # right after a promotion) share one API call and its result
+        request_key = (
+            product_filters.as_canonical_query_string(),
+            *sorted((validators or {}).items()),
+        )
+        return await self._product_page_requests.do(
+            request_key,
+            partial(self._fetch_product_page, product_filters, validators),
+        )
+
+    async def _fetch_product_page(
+        self, product_filters: ProductFilters, validators: Optional[Validators] = None
+    ) -> ConditionalResponse:
         url = (
             self._api_base.copy()
             .add(
@@ -53,15 +185,30 @@ class Client:
             )
             .url
         )
-        async with self._session.get(url, allow_redirects=False) as response:
-            return await response.json()
+        return await self._get_json("/shoes/", url, "product_page", validators)
 
     async def create_order(self, order_data: Dict[str, Any]) -> None:
+        # Not idempotent, so it's never retried, but still fails fast
+        breaker = self.get_breaker("/order/")
+        breaker.check()
         url = self._api_base.copy().add(path="/order/").url
-        async with self._session.post(url, json=order_data) as response:
-            if response.status == 201:
-                data = await response.json()
-                logger.info(f"Order was successfully created: {data}")
-            else:
-                errors = await response.json()
-                raise ValueError(f"Order wasn't created {errors}")
+        try:
+            async with self._session.post(
+                url, json=order_data, timeout=self._get_timeout("order")
+            ) as response:
+                if response.status >= 500:
+                    response.raise_for_status()
+                data = await self._read_json(response)
+        except RETRY_ERRORS:
+            breaker.record_failure()
+            raise
+        except UnexpectedResponse:
+            # The API has answered, so it's not a failure
+            breaker.record_success()
+            raise
+        breaker.record_success()
+
+        if response.status == 201:
+            logger.info(f"Order was successfully created: {data}")
+        else:
+            raise ValueError(f"Order wasn't created {data}")
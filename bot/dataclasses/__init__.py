@@ -1,3 +1,3 @@
 # flake8: noqa
 from .product import Picture, Product, Size, StockItem
-from .product_page import ProductPage, ProductPageException
+from .product_page import LazyResults, ProductPage, ProductPageException
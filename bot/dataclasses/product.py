@@ -1,10 +1,12 @@
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
 from decimal import Decimal
-from typing import NamedTuple, Optional, Sequence
+from typing import NamedTuple, Optional, Tuple
 
 from babel.numbers import format_currency
 
 from ..bot import N_  # type: ignore
+from .slots import with_slots
 
 
 class Picture(NamedTuple):
@@ -24,6 +26,20 @@ class StockItem(NamedTuple):
     stock: int
 
 
+# Attributes shared by many products, their strings are interned to be stored once
+SHARED_ATTRIBUTES = (
+    "brand",
+    "category",
+    "season",
+    "price_currency",
+    "color",
+    "inner_material",
+    "outer_material",
+    "sole",
+)
+
+
+@with_slots("pictures", "available_stock_items", "content_hash")
 @dataclass
 class Product:
     url: str = field(repr=False)
@@ -41,16 +57,26 @@ class Product:
     outer_material: str = field(repr=False, metadata={"title": N_("Outer material")})
     sole: Optional[str] = field(repr=False, metadata={"title": N_("Sole")})
     main_picture: Picture = field(repr=False)
-    secondary_pictures: Sequence[Picture] = field(repr=False)
-    stock_items: Sequence[StockItem] = field(repr=False)
+    secondary_pictures: Tuple[Picture, ...] = field(repr=False)
+    stock_items: Tuple[StockItem, ...] = field(repr=False)
 
-    def format_price(self, locale: str) -> str:
-        return format_currency(Decimal(self.price), self.price_currency, locale=locale)
+    def __post_init__(self) -> None:
+        for name in SHARED_ATTRIBUTES:
+            value = getattr(self, name)
+            if value is not None:
+                setattr(self, name, sys.intern(value))
 
-    @property
-    def pictures(self) -> Sequence[Picture]:
-        return [pic for pic in [self.main_picture, *self.secondary_pictures]]
+        self.secondary_pictures = tuple(self.secondary_pictures)
+        self.stock_items = tuple(self.stock_items)
+        self.pictures: Tuple[Picture, ...] = (
+            self.main_picture,
+            *self.secondary_pictures,
+        )
+        self.available_stock_items: Tuple[StockItem, ...] = tuple(
+            stock_item for stock_item in self.stock_items if stock_item.stock > 0
+        )
+        # Tells apart versions of the product with the same id
+        self.content_hash = hash(tuple(getattr(self, f.name) for f in fields(self)))
 
-    @property
-    def available_stock_items(self) -> Sequence[StockItem]:
-        return [stock_item for stock_item in self.stock_items if stock_item.stock > 0]
+    def format_price(self, locale: str) -> str:
+        return format_currency(Decimal(self.price), self.price_currency, locale=locale)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Sequence
+from typing import Any, Callable, List, Optional, Sequence, Union, overload
 
 from ..bot import settings  # type: ignore
 from .product import Product
@@ -11,6 +11,44 @@ class ProductPageException(Exception):
     pass
 
 
+class LazyResults(Sequence[Product]):
+    """Page results deserializing each product the first time it's indexed."""
+
+    def __init__(self, raw_results: List[Any], load: Callable[[Any], Product]) -> None:
+        self._raw_results = raw_results
+        self._load = load
+        self._products: List[Optional[Product]] = [None] * len(raw_results)
+
+    @overload
+    def __getitem__(self, index: int) -> Product:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Product]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Product, List[Product]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        product = self._products[index]
+        if product is None:
+            product = self._products[index] = self._load(self._raw_results[index])
+        return product
+
+    def __len__(self) -> int:
+        return len(self._raw_results)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        loaded = sum(product is not None for product in self._products)
+        return f"<{type(self).__name__} {loaded}/{len(self)} loaded>"
+
+
 class PageResultsState:
     def __init__(self, page: ProductPage) -> None:
         self.page = page
@@ -0,0 +1,22 @@
+from dataclasses import fields
+from typing import Callable, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def with_slots(*extra_slots: str) -> Callable[[Type[T]], Type[T]]:
+    """Recreate a dataclass with `__slots__` for its fields and `extra_slots`.
+
+    Dataclasses can't declare slots for their fields in the class body, since
+    the fields' class attributes would conflict with them.
+    """
+
+    def recreate_with_slots(cls: Type[T]) -> Type[T]:
+        field_names = tuple(field_.name for field_ in fields(cls))
+        cls_dict = dict(cls.__dict__)
+        cls_dict["__slots__"] = field_names + extra_slots
+        for name in (*field_names, "__dict__", "__weakref__"):
+            cls_dict.pop(name, None)
+        return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+    return recreate_with_slots
@@ -0,0 +1,9 @@
+from aiogram.utils.emoji import emojize
+
+# Resolved once, texts are built of them without running `emojize`
+CROSS_MARK = emojize(":x:")
+MONEYBAG = emojize(":moneybag:")
+SMALL_BLUE_DIAMOND = emojize(":small_blue_diamond:")
+SMALL_ORANGE_DIAMOND = emojize(":small_orange_diamond:")
+STAR = emojize(":star:")
+WHITE_SMALL_SQUARE = emojize(":white_small_square:")
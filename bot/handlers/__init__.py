@@ -1,2 +1,2 @@
 # flake8: noqa
-from . import answer, buy, commands, filter
+from . import admin, answer, buy, commands, errors, filter
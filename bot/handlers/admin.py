@@ -0,0 +1,16 @@
+from aiogram import types
+from aiogram.dispatcher.filters.state import any_state
+from aiogram.types import ParseMode
+
+from ..bot import dp, settings  # type: ignore
+from ..storage.memory import format_memory_report, report_storage_memory_usage
+
+
+@dp.message_handler(commands=["memory"], user_id=settings.ADMINS, state=any_state)
+async def process_memory_command(message: types.Message) -> None:
+    report = await report_storage_memory_usage(
+        dp.storage, settings.CACHE_KEY_PREFIX, settings.MEMORY_REPORT_SAMPLE
+    )
+    await message.answer(
+        f"```\n{format_memory_report(report)}\n```", parse_mode=ParseMode.MARKDOWN
+    )
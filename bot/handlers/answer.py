@@ -1,22 +1,20 @@
 import logging
-from typing import Match
 
 from aiogram import types
-from aiogram.dispatcher import FSMContext, filters
-from aiogram.dispatcher.filters.state import any_state
+from aiogram.dispatcher import FSMContext
 from aiogram.utils.exceptions import Throttled
 
+from .. import callback_forms
 from ..bot import _, dp  # type: ignore
 from ..product_answers import get_bookmark_answer, get_product, get_product_slide_answer
-from .common import PRODUCT_REGEX, answer_product_slide, handle_product_params
+from ..routing import callback_router
+from .common import PRODUCT_PARAMS, answer_product_slide
 
 logger = logging.getLogger(__name__)
 
 
-@dp.callback_query_handler(
-    filters.Regexp(rf"controls:(?:previous|next):{PRODUCT_REGEX}"), state=any_state
-)
-@handle_product_params
+@callback_router.route(callback_forms.PREVIOUS, *PRODUCT_PARAMS)
+@callback_router.route(callback_forms.NEXT, *PRODUCT_PARAMS)
 async def process_browse_controls(
     callback_query: types.CallbackQuery,
     *,
@@ -27,7 +25,7 @@ async def process_browse_controls(
 ) -> None:
     next_product_index, product_filters = handled_params
     product_slide = await get_product_slide_answer(
-        state, locale, next_product_index, product_filters
+        locale, next_product_index, product_filters
     )
     await answer_product_slide(
         callback_query.message, state, locale, product_slide, edit=True
@@ -35,25 +33,21 @@ async def process_browse_controls(
     await callback_query.answer()
 
 
-@dp.callback_query_handler(
-    filters.Regexp(rf"all_pics:{PRODUCT_REGEX}"), state=any_state
-)
-@handle_product_params
+@callback_router.route(callback_forms.ALL_PICTURES, *PRODUCT_PARAMS)
 async def post_all_pictures(
     callback_query: types.CallbackQuery,
     *,
     state: FSMContext,
     handled_params: tuple,
     locale: str,
-    regexp: Match,
     **kwargs,
 ) -> None:
     try:
-        await dp.throttle(regexp.string, rate=60)
+        await dp.throttle(callback_query.data, rate=60)
     except Throttled:
         await callback_query.answer(_("Please try again in a minute."))
     else:
-        product = await get_product(state, *handled_params)
+        product = await get_product(*handled_params)
         pictures = [
             types.InputMediaPhoto(picture.pic, picture.thumbnail)
             for picture in product.pictures
@@ -62,25 +56,21 @@ async def post_all_pictures(
         await callback_query.answer()
 
 
-@dp.callback_query_handler(
-    filters.Regexp(rf"bookmark:add:{PRODUCT_REGEX}"), state=any_state
-)
-@handle_product_params
+@callback_router.route(callback_forms.ADD, *PRODUCT_PARAMS)
 async def add_bookmark(
     callback_query: types.CallbackQuery,
     *,
     state: FSMContext,
     handled_params: tuple,
     locale: str,
-    regexp: Match,
     **kwargs,
 ) -> None:
     try:
-        await dp.throttle(regexp.string, rate=30)
+        await dp.throttle(callback_query.data, rate=30)
     except Throttled:
         await callback_query.answer(_("Please try again in a minute."))
     else:
-        bookmark = await get_bookmark_answer(state, locale, *handled_params)
+        bookmark = await get_bookmark_answer(locale, *handled_params)
         await callback_query.message.reply(
             await bookmark.get_caption(),
             parse_mode=types.ParseMode.MARKDOWN,
@@ -90,7 +80,7 @@ async def add_bookmark(
         await callback_query.answer()
 
 
-@dp.callback_query_handler(filters.Text("bookmark:delete"), state=any_state)
+@callback_router.route(callback_forms.DELETE)
 async def delete_bookmark(callback_query: types.CallbackQuery) -> None:
     await callback_query.message.delete()
     await callback_query.answer()
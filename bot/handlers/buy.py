@@ -1,32 +1,36 @@
 import json
 import logging
 import re
+from typing import Optional
 
-import aiohttp
 from aiogram import types
 from aiogram.dispatcher import FSMContext, filters
 from aiogram.dispatcher.filters.state import any_state
 from aiogram.types.message import ContentTypes
-from aiogram.utils.emoji import emojize
 
-from .. import texts
+from .. import callback_forms, texts
 from ..bot import _, bot, dp, settings  # type: ignore
 from ..callback_forms import CallbackForm
-from ..client import Client
+from ..client import API_ERRORS, Client
 from ..keyboards import get_invoice_keyboard, get_product_sizes_keyboard
-from ..product_answers import get_product
-from ..product_filters import ProductFilters
+from ..product_answers import ProductChanged, get_product
+from ..product_filters import ProductFilters, filter_sets, resolve_filters_param
+from ..routing import callback_router
 from ..utils import (
     decode_parameter,
     encode_parameter,
     handle_regex_params,
     to_telegram_price,
 )
-from .common import PRODUCT_REGEX, handle_product_params
+from .common import PRODUCT_PARAMS
 from .utils import prepare_order_data
 
 logger = logging.getLogger(__name__)
 
+# Product index, filter set id, size id and product id, which links sent before
+# products were pinned don't have
+INVOICE_REGEX = r"(\d+):([^:]*):(\d+)(?::(\d+))?$"
+
 
 async def answer_product_invoice(
     message: types.Message,
@@ -35,21 +39,21 @@ async def answer_product_invoice(
     product_index: int,
     product_filters: ProductFilters,
     product_size_id: int,
+    product_id: Optional[int] = None,
 ) -> None:
-    product = await get_product(state, product_index, product_filters)
-    product_identifier = (
-        CallbackForm(str(product_index))
-        + product_filters.as_query_string()
-        + str(product_size_id)
-    ).callback_string
-    payload = json.dumps(
-        (product_index, product_filters.as_query_string(), product_size_id)
+    # Without an id the product is pinned from the invoice on
+    product = await get_product(product_index, product_filters, product_id)
+    filter_set_id = filter_sets.make_id(product_filters)
+    await filter_sets.save()
+    product_identifier = CallbackForm(str(product_index)).make_callback_string(
+        filter_set_id, str(product_size_id), str(product.id)
     )
+    payload = json.dumps((product_index, filter_set_id, product_size_id, product.id))
 
     await bot.send_invoice(
         message.chat.id,
         f"{product.name} {product.code}",
-        emojize(texts.INVOICE_DESCRIPTION.value),
+        texts.INVOICE_DESCRIPTION.value,
         payload,
         provider_token=settings.PAYMENTS_PROVIDER_TOKEN,
         start_parameter=encode_parameter(product_identifier),
@@ -79,26 +83,24 @@ async def process_start_invoice_param(
     product_identifier, = handled_params
     logger.debug("Product identifier: %s", product_identifier)
 
-    match = re.match(rf"{PRODUCT_REGEX}:(\d+)", product_identifier)
+    match = re.match(INVOICE_REGEX, product_identifier)
     if not match:
         await message.answer(_("Wrong invoice link."))
         return
 
-    product_index, product_filters, product_size = match.groups()
+    product_index, filter_set_id, product_size, product_id = match.groups()
     await answer_product_invoice(
         message,
         state,
         locale,
         int(product_index),
-        ProductFilters(product_filters),
+        await resolve_filters_param(filter_set_id),
         int(product_size),
+        int(product_id) if product_id else None,
     )
 
 
-@dp.callback_query_handler(
-    filters.Regexp(rf"list_sizes:{PRODUCT_REGEX}"), state=any_state
-)
-@handle_product_params
+@callback_router.route(callback_forms.LIST_SIZES, *PRODUCT_PARAMS)
 async def list_product_sizes(
     callback_query: types.CallbackQuery,
     *,
@@ -108,20 +110,19 @@ async def list_product_sizes(
     **kwargs,
 ) -> None:
     product_index, product_filters = handled_params
-    product = await get_product(state, product_index, product_filters)
+    product = await get_product(product_index, product_filters)
+    filter_set_id = filter_sets.make_id(product_filters)
+    await filter_sets.save()
     await callback_query.message.reply(
-        emojize(_(":shoe: Choose shoe size")),
-        reply_markup=get_product_sizes_keyboard(
-            product, product_index, product_filters
-        ),
+        _(":shoe: Choose shoe size"),
+        reply_markup=get_product_sizes_keyboard(product, product_index, filter_set_id),
     )
     await callback_query.answer()
 
 
-@dp.callback_query_handler(
-    filters.Regexp(rf"buy:(\d+):{PRODUCT_REGEX}"), state=any_state
-)
-@handle_regex_params(int, int, ProductFilters)
+# Size and product ids, then the product parameters
+@callback_router.route(callback_forms.BUY_PRODUCT, int, int, *PRODUCT_PARAMS)
+@callback_router.route(callback_forms.BUY, int, *PRODUCT_PARAMS)
 async def process_buy(
     callback_query: types.CallbackQuery,
     *,
@@ -130,10 +131,17 @@ async def process_buy(
     locale: str,
     **kwargs,
 ) -> None:
-    size_id, product_index, product_filters = handled_params
+    size_id, *product_ids, product_index, product_filters = handled_params
+    product_id = product_ids[0] if product_ids else None
     await callback_query.message.delete()
     await answer_product_invoice(
-        callback_query.message, state, locale, product_index, product_filters, size_id
+        callback_query.message,
+        state,
+        locale,
+        product_index,
+        product_filters,
+        size_id,
+        product_id,
     )
     await callback_query.answer()
 
@@ -160,11 +168,21 @@ async def process_shipping(shipping_query: types.ShippingQuery) -> None:
 async def process_pre_checkout(
     pre_checkout_query: types.PreCheckoutQuery, state: FSMContext
 ) -> None:
-    order_data = await prepare_order_data(state, pre_checkout_query)
+    try:
+        order_data = await prepare_order_data(state, pre_checkout_query)
+    except ProductChanged:
+        # The page changed since the invoice, so it's not what the user saw
+        await bot.answer_pre_checkout_query(
+            pre_checkout_query.id,
+            ok=False,
+            error_message=_("This product has changed, try to /browse again."),
+        )
+        return
+
     client = Client.get_client()
     try:
         await client.create_order(order_data)
-    except (aiohttp.ClientError, ValueError):
+    except (*API_ERRORS, ValueError):
         logger.exception("Unable to create order with data: %s", order_data)
         await bot.answer_pre_checkout_query(
             pre_checkout_query.id,
@@ -183,4 +201,4 @@ async def got_payment(message: types.Message) -> None:
     text = _(
         ":clap: :smile: Woah! Thank's for the purchase! We will contact you shortly."
     )
-    await message.answer(emojize(text))
+    await message.answer(text)
@@ -4,7 +4,6 @@ from aiogram import types
 from aiogram.dispatcher import FSMContext, filters
 from aiogram.dispatcher.filters.state import any_state
 from aiogram.types import ParseMode
-from aiogram.utils.emoji import emojize
 
 from .. import texts
 from ..bot import _, dp, settings  # type: ignore
@@ -35,7 +34,7 @@ async def process_contacts_command(message: types.Message) -> None:
         phones="\n".join(settings.CONTACT_PHONES),
         emails="\n".join(settings.CONTACT_EMAILS),
     )
-    await message.answer(emojize(text), parse_mode=ParseMode.MARKDOWN)
+    await message.answer(text, parse_mode=ParseMode.MARKDOWN)
 
 
 @dp.message_handler(filters.Text(PRIME_KEYBOARD_TEXTS["browse"]))
@@ -52,4 +51,4 @@ async def process_browse_command(
 
 @dp.message_handler(state=any_state)
 async def process_unknown(message: types.Message) -> None:
-    await message.reply(emojize(_("What..? :confused: I can't recognize that.")))
+    await message.reply(_("What..? :confused: I can't recognize that."))
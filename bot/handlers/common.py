@@ -4,20 +4,17 @@ from typing import Dict, Optional
 from aiogram import types
 from aiogram.dispatcher import FSMContext
 from aiogram.types import ParseMode
-from aiogram.utils.emoji import emojize
 
-from ..bot import _, settings  # type: ignore
+from ..bot import _, dp, settings  # type: ignore
 from ..dataclasses import ProductPageException
-from ..keyboards import get_filter_choices_keyboard
+from ..keyboards import get_filter_step_keyboard
 from ..product_answers import ProductAnswer, get_product_slide_answer
-from ..product_filters import FILTER_CHOICES_GETTERS, ProductFilters
-from ..utils import handle_regex_params
+from ..product_filters import ProductFilters, resolve_filters_param
 
 logger = logging.getLogger(__name__)
 
-PRODUCT_REGEX = r"(\d+):(.+|)"
-
-handle_product_params = handle_regex_params(int, ProductFilters)
+# Handlers of the parameters of product callbacks
+PRODUCT_PARAMS = (int, resolve_filters_param)
 
 
 async def answer_product_slide(
@@ -27,6 +24,7 @@ async def answer_product_slide(
     product_slide: ProductAnswer,
     edit: bool = False,
 ) -> None:
+    await dp.storage.flush_unit_of_work()
     product = product_slide.product
     caption = await product_slide.get_caption()
     keyboard = product_slide.make_keyboard()
@@ -59,7 +57,7 @@ async def _answer_filter_results(
 
     try:
         product_slide = await get_product_slide_answer(
-            state, locale, 0, ProductFilters(filters)
+            locale, 0, ProductFilters(filters)
         )
     except ProductPageException:
         await message.answer(_("No results, try to /browse again."))
@@ -98,17 +96,11 @@ async def _answer_product_filter(
     else:
         relation_value = None
 
-    choices_getter = FILTER_CHOICES_GETTERS[filter_name]
-    filter_choices = await choices_getter(relation_value=relation_value)
+    keyboard = await get_filter_step_keyboard(filter_name, relation_value)
 
     filter_title = _(filter_settings.title)
-    text = emojize(
-        _(":wavy_dash: Select a {filter_title} option").format(
-            filter_title=filter_title
-        )
-    )
-    keyboard = get_filter_choices_keyboard(
-        filter_choices, row_width=filter_settings.choices_keyboard_width
+    text = _(":wavy_dash: Select a {filter_title} option").format(
+        filter_title=filter_title
     )
 
     if not edit:
@@ -124,6 +116,8 @@ async def answer_next_filter_or_results(
     next_filter: Optional[str],
     starts_up: bool = False,
 ) -> None:
+    # Chosen filters are saved before the answer
+    await dp.storage.flush_unit_of_work()
     if next_filter:
         await _answer_product_filter(message, state, edit=not starts_up)
     else:
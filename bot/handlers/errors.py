@@ -0,0 +1,43 @@
+import logging
+
+from aiogram import types
+
+from ..bot import _, bot, dp  # type: ignore
+from ..client import API_ERRORS
+from ..product_answers import ProductChanged
+from ..product_filters import UnknownFilterSet
+
+logger = logging.getLogger(__name__)
+
+
+async def answer_error(
+    update: types.Update, text: str, show_alert: bool = False
+) -> None:
+    if update.callback_query:
+        await update.callback_query.answer(text, show_alert=show_alert)
+    elif update.message:
+        await update.message.answer(text)
+    elif update.pre_checkout_query:
+        # Telegram cancels the payment if it isn't answered in time anyway
+        await bot.answer_pre_checkout_query(
+            update.pre_checkout_query.id, ok=False, error_message=text
+        )
+
+
+@dp.errors_handler(exception=API_ERRORS)
+async def process_api_error(update: types.Update, exception: Exception) -> bool:
+    # Nothing to fall back on, so just let the user know instead of hanging
+    logger.error("API is unavailable for %s: %r", update, exception)
+    await answer_error(update, _("Something went wrong. Try again later."))
+    return True
+
+
+@dp.errors_handler(exception=UnknownFilterSet)
+@dp.errors_handler(exception=ProductChanged)
+async def process_outdated_message(update: types.Update, exception: Exception) -> bool:
+    # The filter set id of the button expired or the page changed since
+    logger.info("Outdated message: %r", exception)
+    await answer_error(
+        update, _("This message is outdated, try to /browse again."), show_alert=True
+    )
+    return True
@@ -1,19 +1,18 @@
 import logging
 
 from aiogram import types
-from aiogram.dispatcher import FSMContext, filters
+from aiogram.dispatcher import FSMContext
 
-from ..bot import dp, settings  # type: ignore
+from .. import callback_forms
+from ..bot import settings  # type: ignore
+from ..routing import callback_router
 from ..states import ProductFiltersForm
-from ..utils import handle_regex_params
 from .common import answer_next_filter_or_results
 
 logger = logging.getLogger(__name__)
 
 
-@dp.callback_query_handler(
-    filters.Text("filter:skip"), state=ProductFiltersForm.all_states
-)
+@callback_router.route(callback_forms.SKIP, state=ProductFiltersForm.all_states)
 async def process_filter_skip(
     callback_query: types.CallbackQuery, state: FSMContext, locale: str
 ) -> None:
@@ -24,9 +23,7 @@ async def process_filter_skip(
     await callback_query.answer()
 
 
-@dp.callback_query_handler(
-    filters.Text(r"filter:skip_all"), state=ProductFiltersForm.all_states
-)
+@callback_router.route(callback_forms.SKIP_ALL, state=ProductFiltersForm.all_states)
 async def process_filter_skip_all(
     callback_query: types.CallbackQuery, state: FSMContext, locale: str
 ) -> None:
@@ -35,10 +32,9 @@ async def process_filter_skip_all(
     await callback_query.answer()
 
 
-@dp.callback_query_handler(
-    filters.Regexp(r"filter:choice:(\w+):(\w+)"), state=ProductFiltersForm.all_states
+@callback_router.route(
+    callback_forms.CHOICE, None, None, state=ProductFiltersForm.all_states
 )
-@handle_regex_params(None, None)
 async def process_filter_choice(
     callback_query: types.CallbackQuery,
     *,
@@ -6,7 +6,7 @@ from aiogram.dispatcher import FSMContext
 
 from ..bot import settings  # type: ignore
 from ..product_answers import get_product
-from ..product_filters import ProductFilters
+from ..product_filters import resolve_filters_param
 from ..utils import is_admin
 
 
@@ -14,8 +14,11 @@ async def prepare_order_data(
     state: FSMContext, pre_checkout_query: types.PreCheckoutQuery
 ) -> Dict[str, Any]:
     payload = json.loads(pre_checkout_query.invoice_payload)
-    product_index, product_filters, size_id = payload
-    product = await get_product(state, product_index, ProductFilters(product_filters))
+    # Invoices sent before products were pinned have no product ids
+    product_index, filter_set_id, size_id, *product_ids = payload
+    product_id = product_ids[0] if product_ids else None
+    product_filters = await resolve_filters_param(filter_set_id)
+    product = await get_product(product_index, product_filters, product_id)
     order_info, address = (
         pre_checkout_query.order_info,
         pre_checkout_query.order_info.shipping_address,
@@ -0,0 +1,43 @@
+import gettext
+from typing import Dict, Optional
+
+from aiogram.contrib.middlewares.i18n import I18nMiddleware
+from aiogram.utils.emoji import emojize
+
+
+class EmojiI18nMiddleware(I18nMiddleware):
+    """I18n middleware giving texts with emoji shortcodes already resolved.
+
+    Translations are emojized once when the catalogs load and untranslated
+    messages the first time they are requested, so texts got from it don't
+    need `emojize` at all.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._emojized_messages: Dict[str, str] = {}
+        super().__init__(*args, **kwargs)
+
+    def find_locales(self) -> Dict[str, gettext.GNUTranslations]:
+        translations = super().find_locales()
+        for translation in translations.values():
+            catalog = translation._catalog  # type: ignore
+            for key, message in catalog.items():
+                catalog[key] = emojize(message)
+        self._emojized_messages.clear()
+        return translations
+
+    def gettext(
+        self,
+        singular: str,
+        plural: Optional[str] = None,
+        n: int = 1,
+        locale: Optional[str] = None,
+    ) -> str:
+        text = super().gettext(singular, plural, n, locale)
+        # Untranslated messages are returned as they are in the source code
+        if text is singular or text is plural:
+            emojized = self._emojized_messages.get(text)
+            if emojized is None:
+                emojized = self._emojized_messages[text] = emojize(text)
+            return emojized
+        return text
@@ -0,0 +1,55 @@
+import json
+import logging
+from functools import partial
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class JsonCodec(NamedTuple):
+    name: str
+    loads: Callable[[Union[str, bytes]], Any]
+    dumps: Callable[[Any], str]
+    dumps_bytes: Callable[[Any], bytes]
+
+
+_stdlib_dumps = partial(json.dumps, separators=(",", ":"), ensure_ascii=False)
+
+STDLIB_CODEC = JsonCodec(
+    "json",
+    json.loads,
+    _stdlib_dumps,
+    lambda value: _stdlib_dumps(value).encode(),
+)
+
+
+def _make_orjson_codec() -> JsonCodec:
+    # Non string keys are converted to strings just like stdlib does
+    dumps_bytes = partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+    return JsonCodec(
+        "orjson",
+        orjson.loads,
+        lambda value: dumps_bytes(value).decode(),
+        dumps_bytes,
+    )
+
+
+def get_json_codec(name: Optional[str] = None) -> JsonCodec:
+    """Return the codec by its name, "orjson" falls back to "json".
+
+    Without a name it's orjson if it's installed and stdlib json if not.
+    """
+    if name is None:
+        return _make_orjson_codec() if orjson is not None else STDLIB_CODEC
+    if name == "orjson":
+        if orjson is not None:
+            return _make_orjson_codec()
+        logger.warning("orjson isn't installed, stdlib json is used instead.")
+    elif name != "json":
+        raise ValueError(f"Unknown JSON codec '{name}'.")
+    return STDLIB_CODEC
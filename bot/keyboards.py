@@ -1,6 +1,6 @@
 import logging
 from collections import OrderedDict
-from typing import Sequence
+from typing import Any, NamedTuple, Optional, Sequence
 
 from aiogram.types import (
     InlineKeyboardButton,
@@ -8,12 +8,13 @@ from aiogram.types import (
     KeyboardButton,
     ReplyKeyboardMarkup,
 )
-from aiogram.utils.emoji import emojize
 
-from . import callback_forms
-from .bot import N_, _  # type: ignore
+from . import callback_forms, emojis
+from .bot import N_, _, settings  # type: ignore
+from .caching import LRUCache
 from .dataclasses import Product
-from .product_filters import FilterChoice, ProductFilters
+from .product_filters import FilterChoice, get_memoized_choices
+from .utils import get_current_locale
 
 logger = logging.getLogger(__name__)
 
@@ -40,31 +41,56 @@ def get_filter_choices_keyboard(
 
     markup.add(
         InlineKeyboardButton(
-            emojize(_(":white_small_square: Skip")),
+            _(":white_small_square: Skip"),
             callback_data=callback_forms.SKIP.callback_string,
         ),
         InlineKeyboardButton(
-            emojize(_(":black_small_square: Skip all")),
+            _(":black_small_square: Skip all"),
             callback_data=callback_forms.SKIP_ALL.callback_string,
         ),
     )
     return markup
 
 
+class ChoicesKeyboard(NamedTuple):
+    choices: Sequence[FilterChoice]
+    markup: InlineKeyboardMarkup
+
+
+# Keyed by filter name, relation value and locale like the memoized choices
+_choices_keyboards: LRUCache[ChoicesKeyboard] = LRUCache(
+    "choices_keyboards", max_weight=settings.FILTER_STEPS_CACHE_SIZE
+)
+
+
+async def get_filter_step_keyboard(
+    filter_name: str, relation_value: Optional[Any] = None
+) -> InlineKeyboardMarkup:
+    # Rebuilt only along with the memoized choices, the markup is never changed
+    choices = await get_memoized_choices(filter_name, relation_value)
+    keyboard_key = (filter_name, relation_value, get_current_locale())
+    keyboard = _choices_keyboards.get(keyboard_key)
+    if keyboard is None or keyboard.choices is not choices:
+        markup = get_filter_choices_keyboard(
+            choices,
+            row_width=settings.PRODUCT_FILTERS[filter_name].choices_keyboard_width,
+        )
+        keyboard = ChoicesKeyboard(choices, markup)
+        _choices_keyboards.set(keyboard_key, keyboard)
+    return keyboard.markup
+
+
 def get_product_sizes_keyboard(
-    product: Product, product_index: int, product_filters: ProductFilters
+    product: Product, product_index: int, filter_set_id: str
 ) -> InlineKeyboardMarkup:
     markup = InlineKeyboardMarkup(row_width=5)
     for __, (size_id, size), __ in product.stock_items:
-        callback_data = (
-            callback_forms.BUY
-            + str(size_id)
-            + str(product_index)
-            + product_filters.as_query_string()
-        ).callback_string
+        callback_data = callback_forms.BUY_PRODUCT.make_callback_string(
+            str(size_id), str(product.id), str(product_index), filter_set_id
+        )
         markup.insert(
             InlineKeyboardButton(
-                emojize(f":white_small_square: {size}"), callback_data=callback_data
+                f"{emojis.WHITE_SMALL_SQUARE} {size}", callback_data=callback_data
             )
         )
 
@@ -75,5 +101,5 @@ def get_invoice_keyboard(product: Product, locale: str) -> InlineKeyboardMarkup:
     pay_text = _(":moneybag: Buy {price}").format(price=product.format_price(locale))
     return InlineKeyboardMarkup(
         row_width=1,
-        inline_keyboard=[[InlineKeyboardButton(emojize(pay_text), pay=True)]],
+        inline_keyboard=[[InlineKeyboardButton(pay_text, pay=True)]],
     )
@@ -1,3 +1,8 @@
 # flake8: noqa
 from .answers import BookmarkAnswer, ProductAnswer, ProductSlideAnswer
-from .getters import get_bookmark_answer, get_product, get_product_slide_answer
+from .getters import (
+    ProductChanged,
+    get_bookmark_answer,
+    get_product,
+    get_product_slide_answer,
+)
@@ -1,14 +1,14 @@
 from dataclasses import InitVar, dataclass, field
-from typing import ClassVar, Optional, Type
+from typing import ClassVar, Dict, List, Optional, Type
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
-from aiogram.utils.emoji import emojize
 
 from .. import callback_forms
-from ..bot import _, settings  # type: ignore
+from ..bot import settings  # type: ignore
 from ..dataclasses import Product, ProductPage
-from ..product_filters import ProductFilters
+from ..product_filters import ProductFilters, filter_sets
 from .captions import BookmarkCaption, Caption, SlideCaption
+from .labels import ButtonLabels, get_button_labels
 
 
 @dataclass
@@ -21,8 +21,12 @@ class ProductAnswer:
     locale: InitVar[str]
 
     def __post_init__(self, locale: str) -> None:
+        self.locale = locale
         self.product = self.product_page[self.product_index]
         self.caption = self.caption_type(self.product, self.product_filters, locale)
+        self.labels: ButtonLabels = get_button_labels(locale)
+        self.filter_set_id = filter_sets.make_id(self.product_filters)
+        self._product_params = (str(self.product_index), self.filter_set_id)
 
     async def get_caption(self) -> str:
         return await self.caption.to_string()
@@ -32,18 +36,14 @@ class ProductAnswer:
 
     @property
     def detail_button(self) -> InlineKeyboardButton:
-        return InlineKeyboardButton(emojize(_(":link: Detail")), url=self.product.url)
+        return InlineKeyboardButton(self.labels.detail, url=self.product.url)
 
     @property
     def buy_procedure_button(self) -> InlineKeyboardButton:
-        callback_data = (
-            callback_forms.LIST_SIZES
-            + str(self.product_index)
-            + self.product_filters.as_query_string()
-        ).callback_string
-        return InlineKeyboardButton(
-            emojize(_(":moneybag: Buy")), callback_data=callback_data
+        callback_data = callback_forms.LIST_SIZES.make_callback_string(
+            *self._product_params
         )
+        return InlineKeyboardButton(self.labels.buy, callback_data=callback_data)
 
 
 @dataclass
@@ -51,6 +51,7 @@ class ProductSlideAnswer(ProductAnswer):
     caption_type = SlideCaption
 
     FIRST_SLIDE_INDEX, LAST_SLIDE_INDEX = 0, settings.PRODUCT_PAGE_SIZE - 1
+    PREFETCH_THRESHOLD = settings.PRODUCT_PAGE_PREFETCH_THRESHOLD
 
     has_previous_slide: bool = field(init=False)
     has_next_slide: bool = field(init=False)
@@ -69,30 +70,41 @@ class ProductSlideAnswer(ProductAnswer):
         out_of_all_number = self.product_page.get_out_of_all_number(self.product_index)
         self.out_of_all = f"{out_of_all_number} / {self.product_page.count}"
 
-    def make_keyboard(self) -> InlineKeyboardMarkup:
-        markup = InlineKeyboardMarkup(row_width=4)
-
-        prev_button = self.previous_button
-        if prev_button is not None:
-            markup.insert(prev_button)
-
-        markup.insert(InlineKeyboardButton(self.out_of_all, url=self.product.url))
+        # Ids are made along with the answer, so they're stored before it's sent
+        self._page_filter_set_ids: Dict[int, str] = {}
+        page_number = self.product_page.page
+        for has_page, adjacent_page in [
+            (self.has_previous_page, page_number - 1),
+            (self.has_next_page, page_number + 1),
+        ]:
+            if has_page:
+                filters: ProductFilters = self.product_filters.copy()
+                filters["page"] = adjacent_page
+                self._page_filter_set_ids[adjacent_page] = filter_sets.make_id(filters)
 
-        next_button = self.next_button
-        if next_button is not None:
-            markup.insert(next_button)
-
-        markup.add(
+    def make_keyboard(self) -> InlineKeyboardMarkup:
+        controls = [
+            self.previous_button,
+            InlineKeyboardButton(self.out_of_all, url=self.product.url),
+            self.next_button,
+        ]
+        actions = [
             self.all_pictures_button,
             self.add_bookmark_button,
             self.detail_button,
             self.buy_procedure_button,
+        ]
+        return InlineKeyboardMarkup(
+            row_width=4,
+            inline_keyboard=[
+                [button for button in controls if button is not None],
+                actions,
+            ],
         )
-        return markup
 
     @property
     def previous_button(self) -> Optional[InlineKeyboardButton]:
-        button_text = emojize(_(":arrow_backward: Previous"))
+        button_text = self.labels.previous
         if self.has_previous_slide:
             return InlineKeyboardButton(
                 button_text,
@@ -105,15 +117,15 @@ class ProductSlideAnswer(ProductAnswer):
                 button_text,
                 callback_data=self._make_controls_callback(
                     callback_forms.PREVIOUS,
-                    self.product_index - 1,
                     self.LAST_SLIDE_INDEX,
+                    self.product_page.page - 1,
                 ),
             )
         return None
 
     @property
     def next_button(self) -> Optional[InlineKeyboardButton]:
-        button_text = emojize(_(":arrow_forward: Next"))
+        button_text = self.labels.next
         if self.has_next_slide:
             return InlineKeyboardButton(
                 button_text,
@@ -132,27 +144,32 @@ class ProductSlideAnswer(ProductAnswer):
             )
         return None
 
+    @property
+    def pages_to_prefetch(self) -> List[int]:
+        # Adjacent pages the user is close to slide over to
+        page_number = self.product_page.page
+        pages = []
+        if (
+            self.has_next_page
+            and self.product_page.last_item_index - self.product_index
+            < self.PREFETCH_THRESHOLD
+        ):
+            pages.append(page_number + 1)
+        if self.has_previous_page and self.product_index < self.PREFETCH_THRESHOLD:
+            pages.append(page_number - 1)
+        return pages
+
     @property
     def all_pictures_button(self) -> InlineKeyboardButton:
-        callback_data = (
-            callback_forms.ALL_PICTURES
-            + str(self.product_index)
-            + self.product_filters.as_query_string()
-        ).callback_string
-        return InlineKeyboardButton(
-            emojize(_(":framed_picture: Pictures")), callback_data=callback_data
+        callback_data = callback_forms.ALL_PICTURES.make_callback_string(
+            *self._product_params
         )
+        return InlineKeyboardButton(self.labels.pictures, callback_data=callback_data)
 
     @property
     def add_bookmark_button(self) -> InlineKeyboardButton:
-        callback_data = (
-            callback_forms.ADD
-            + str(self.product_index)
-            + self.product_filters.as_query_string()
-        ).callback_string
-        return InlineKeyboardButton(
-            emojize(_(":bookmark: Bookmark")), callback_data=callback_data
-        )
+        callback_data = callback_forms.ADD.make_callback_string(*self._product_params)
+        return InlineKeyboardButton(self.labels.bookmark, callback_data=callback_data)
 
     def _make_controls_callback(
         self,
@@ -160,12 +177,11 @@ class ProductSlideAnswer(ProductAnswer):
         product_index: int,
         page_num: Optional[int] = None,
     ) -> str:
-        filters: ProductFilters = self.product_filters.copy()
+        filter_set_id = self.filter_set_id
         if page_num is not None:
-            filters["page"] = page_num
+            filter_set_id = self._page_filter_set_ids[page_num]
 
-        callback_form = form + str(product_index) + filters.as_query_string()
-        return callback_form.callback_string
+        return form.make_callback_string(str(product_index), filter_set_id)
 
 
 class BookmarkAnswer(ProductAnswer):
@@ -182,5 +198,6 @@ class BookmarkAnswer(ProductAnswer):
     @property
     def delete_bookmark_button(self) -> InlineKeyboardButton:
         return InlineKeyboardButton(
-            emojize(":x:"), callback_data=callback_forms.DELETE.callback_string
+            self.labels.delete_bookmark,
+            callback_data=callback_forms.DELETE.callback_string,
         )
@@ -2,15 +2,19 @@ import logging
 from dataclasses import fields
 from typing import AsyncIterator, Iterator, NamedTuple, Optional, Tuple
 
-from aiogram.utils.emoji import emojize
 from aiogram.utils.markdown import bold, italic, link as md_link, text as md_text
 
+from .. import emojis
 from ..bot import _, settings  # type: ignore
+from ..caching import LRUCache
 from ..dataclasses import Product
 from ..product_filters import ProductFilters
 
 logger = logging.getLogger(__name__)
 
+# Rendered captions are shared by all users seeing a product with the same filters
+caption_cache: LRUCache[str] = LRUCache("captions", **settings.CAPTION_CACHE)
+
 
 class CaptionFormat(NamedTuple):
     caption_text_sep: str = "\n"
@@ -28,19 +32,46 @@ class Caption:
     def __init__(self, product: Product, product_filters: ProductFilters, locale: str):
         self.product = product
         self.product_filters = product_filters
-        self._pictures_links = [picture.pic for picture in self.product.pictures]
-        self._product_link = md_link(self.product.name, self.product.url)
-        self._new_text = italic(_("New")) if self.product.is_new else ""
-        self._price_text = self.product.format_price(locale)
+        self.locale = locale
+
+    @property
+    def cache_key(self) -> Tuple[str, int, int, str, str]:
+        return (
+            type(self).__name__,
+            self.product.id,
+            self.product.content_hash,
+            self.locale,
+            self.product_filters.as_filter_set_key(),
+        )
 
     async def to_string(self) -> str:
+        cache_key = self.cache_key
+        caption = caption_cache.get(cache_key)
+        if caption is None:
+            caption = await self._render()
+            caption_cache.set(cache_key, caption)
+        logger.debug("Caption cache info: %s", caption_cache)
+        return caption
+
+    @property
+    def _product_link(self) -> str:
+        return md_link(self.product.name, self.product.url)
+
+    @property
+    def _new_text(self) -> str:
+        return italic(_("New")) if self.product.is_new else ""
+
+    @property
+    def _price_text(self) -> str:
+        return self.product.format_price(self.locale)
+
+    async def _render(self) -> str:
         filters_texts = await self._join_product_filters_texts()
-        caption = md_text(
+        return md_text(
             self._get_title(),
             md_text(self._get_text(), filters_texts, sep=self.format.text_filters_sep),
             sep=self.format.caption_text_sep,
         )
-        return emojize(caption)
 
     def _get_title(self) -> str:
         raise NotImplementedError()
@@ -90,9 +121,9 @@ class SlideCaption(Caption):
     def _get_title(self) -> str:
         return md_text(
             self._new_text,
-            ":small_blue_diamond:",
+            emojis.SMALL_BLUE_DIAMOND,
             self._product_link,
-            ":moneybag:",
+            emojis.MONEYBAG,
             self._price_text,
         )
 
@@ -102,11 +133,11 @@ class BookmarkCaption(Caption):
 
     def _get_title(self) -> str:
         return md_text(
-            ":star:",
+            emojis.STAR,
             bold(_("Bookmark")),
             self._new_text,
-            ":small_orange_diamond:",
+            emojis.SMALL_ORANGE_DIAMOND,
             self._product_link,
-            ":moneybag:",
+            emojis.MONEYBAG,
             self._price_text,
         )
@@ -1,42 +1,141 @@
+import asyncio
 import logging
+import time
 from functools import partial
-from typing import Any, Dict, Type, TypeVar
+from typing import Any, Dict, Optional, Set, Tuple, Type, TypeVar
 
-from aiogram.dispatcher import FSMContext
-
-from ..bot import settings  # type: ignore
-from ..client import Client
+from ..bot import serializer, settings  # type: ignore
+from ..caching import CachedPage, LRUCache, SharedPageCache, SingleFlight
+from ..client import API_ERRORS, Client
 from ..dataclasses import Product, ProductPage
-from ..product_filters import ProductFilters
-from ..schemas import ProductPageSchema
+from ..product_filters import ProductFilters, filter_sets
+from ..schemas import deserialize_product_page
 from .answers import BookmarkAnswer, ProductAnswer, ProductSlideAnswer
 
 logger = logging.getLogger(__name__)
 
 
-async def get_product_page(
-    state: FSMContext, product_filters: ProductFilters
-) -> ProductPage:
-    generic_data = await state.get_data()
-    cached_page: Dict[str, Any] = generic_data.get(settings.CACHED_PAGE_STORAGE_KEY)
+class ProductChanged(Exception):
+    pass
+
+
+product_page_cache = SharedPageCache(
+    "pages", **settings.PRODUCT_PAGE_CACHE, serializer=serializer
+)
+
+# Pages are parsed once and the parsed pages are shared by all users
+parsed_pages_cache: LRUCache[ProductPage] = LRUCache(
+    "parsed_pages", **settings.PARSED_PAGES_CACHE
+)
+
+_page_loads = SingleFlight()
+
+_prefetches: Set[asyncio.Future] = set()
+
+
+def _make_page_key(client: Client, product_filters: ProductFilters) -> str:
+    return product_page_cache.make_page_key(
+        client.locale, product_filters.as_canonical_query_string()
+    )
+
+
+async def _fetch_raw_page(
+    client: Client,
+    page_key: str,
+    product_filters: ProductFilters,
+    cached_page: Optional[CachedPage] = None,
+) -> Tuple[Dict[str, Any], int]:
+    # The cached page is revalidated, not fetched again if it's not modified
+    validators = cached_page.validators if cached_page is not None else None
+    response = await client.fetch_product_page(product_filters, validators)
+    if response.not_modified and cached_page is not None:
+        await product_page_cache.touch(page_key, cached_page)
+        return cached_page.page, cached_page.size
+
+    size = await product_page_cache.set(page_key, response.data, response.validators)
+    return response.data, size
 
-    raw_page: Dict[str, Any]
-    if cached_page and cached_page["filters"] == product_filters:
-        raw_page = cached_page["page"]
-    else:
-        client = Client.get_client()
-        raw_page = await client.fetch_product_page(product_filters)
-        cached_page = {"page": raw_page, "filters": product_filters.data}
-        await state.update_data({settings.CACHED_PAGE_STORAGE_KEY: cached_page})
 
-    return ProductPageSchema().load(raw_page)
+async def _load_product_page(
+    client: Client, page_key: str, product_filters: ProductFilters
+) -> ProductPage:
+    cached_page = await product_page_cache.get(page_key)
+    stored_at = None
+    if cached_page is not None and cached_page.is_fresh:
+        raw_page, size = cached_page.page, cached_page.size
+        # The parsed page is only fresh for what's left of the shared page's TTL
+        stored_at = time.monotonic() - (time.time() - cached_page.stored_at)
+    else:
+        try:
+            raw_page, size = await _fetch_raw_page(
+                client, page_key, product_filters, cached_page
+            )
+        except API_ERRORS:
+            if cached_page is None:
+                raise
+            # Stale pages aren't kept parsed, the API may be back on the next click
+            logger.warning("Serving stale page %s.", page_key, exc_info=True)
+            return deserialize_product_page(cached_page.page)
+
+    product_page = deserialize_product_page(raw_page)
+    parsed_pages_cache.set(page_key, product_page, weight=size, stored_at=stored_at)
+    return product_page
+
+
+async def load_product_page(
+    client: Client, product_filters: ProductFilters
+) -> Tuple[str, ProductPage]:
+    page_key = _make_page_key(client, product_filters)
+    product_page = parsed_pages_cache.get(page_key)
+    if product_page is None:
+        product_page = await _page_loads.do(
+            page_key, partial(_load_product_page, client, page_key, product_filters)
+        )
+    logger.debug("Page caches info: %s, %s", parsed_pages_cache, product_page_cache)
+    return page_key, product_page
+
+
+async def get_product_page(product_filters: ProductFilters) -> ProductPage:
+    # Pages are shared by all users, so a page may change between clicks
+    __, product_page = await load_product_page(Client.get_client(), product_filters)
+    return product_page
+
+
+async def prefetch_product_page(locale: str, product_filters: ProductFilters) -> None:
+    client = Client.get_client(locale)
+    if _make_page_key(client, product_filters) in parsed_pages_cache:
+        return
+
+    logger.debug("Prefetching page %s.", product_filters)
+    try:
+        await load_product_page(client, product_filters)
+    except Exception:
+        logger.exception("Unable to prefetch page %s.", product_filters)
+
+
+def schedule_adjacent_pages_prefetch(product_slide: ProductSlideAnswer) -> None:
+    for page_number in product_slide.pages_to_prefetch:
+        product_filters: ProductFilters = product_slide.product_filters.copy()
+        product_filters["page"] = page_number
+
+        future = asyncio.ensure_future(
+            prefetch_product_page(product_slide.locale, product_filters)
+        )
+        _prefetches.add(future)
+        future.add_done_callback(_prefetches.discard)
 
 
 async def get_product(
-    state: FSMContext, product_index: int, product_filters: ProductFilters
+    product_index: int,
+    product_filters: ProductFilters,
+    product_id: Optional[int] = None,
 ) -> Product:
-    product_page = await get_product_page(state, product_filters)
-    return product_page[product_index]
+    product_page = await get_product_page(product_filters)
+    product = product_page[product_index]
+    # The product shown to the user must be the one that's bought
+    if product_id is not None and product.id != product_id:
+        raise ProductChanged(product_id)
+    return product
 
 
 T = TypeVar("T", bound=ProductAnswer)
@@ -44,15 +143,28 @@ T = TypeVar("T", bound=ProductAnswer)
 
 async def get_product_answer(
     answer_type: Type[T],
-    state: FSMContext,
     locale: str,
     product_index: int,
     product_filters: ProductFilters,
 ) -> T:
-    page = await get_product_page(state, product_filters)
-    return answer_type(page, product_index, product_filters, locale)
+    page = await get_product_page(product_filters)
+    product_answer = answer_type(page, product_index, product_filters, locale)
+    # Callbacks of the answer refer to the filter sets by their ids
+    await filter_sets.save()
+    return product_answer
+
 
+async def get_product_slide_answer(
+    locale: str,
+    product_index: int,
+    product_filters: ProductFilters,
+) -> ProductSlideAnswer:
+    product_slide = await get_product_answer(
+        ProductSlideAnswer, locale, product_index, product_filters
+    )
+    # Slides of the adjacent page are served from cache once the user gets there
+    schedule_adjacent_pages_prefetch(product_slide)
+    return product_slide
 
-get_product_slide_answer = partial(get_product_answer, ProductSlideAnswer)
 
 get_bookmark_answer = partial(get_product_answer, BookmarkAnswer)
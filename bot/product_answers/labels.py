@@ -0,0 +1,48 @@
+import logging
+from typing import Dict, NamedTuple
+
+from .. import emojis
+from ..bot import _, i18n  # type: ignore
+from ..utils import get_current_locale
+
+logger = logging.getLogger(__name__)
+
+
+class ButtonLabels(NamedTuple):
+    previous: str
+    next: str
+    pictures: str
+    bookmark: str
+    delete_bookmark: str
+    detail: str
+    buy: str
+
+
+_button_labels: Dict[str, ButtonLabels] = {}
+
+
+def _make_button_labels(locale: str) -> ButtonLabels:
+    return ButtonLabels(
+        previous=_(":arrow_backward: Previous", locale=locale),
+        next=_(":arrow_forward: Next", locale=locale),
+        pictures=_(":framed_picture: Pictures", locale=locale),
+        bookmark=_(":bookmark: Bookmark", locale=locale),
+        delete_bookmark=emojis.CROSS_MARK,
+        detail=_(":link: Detail", locale=locale),
+        buy=_(":moneybag: Buy", locale=locale),
+    )
+
+
+def get_button_labels(locale: str) -> ButtonLabels:
+    # Labels are translated once per locale
+    locale = get_current_locale(locale)
+    labels = _button_labels.get(locale)
+    if labels is None:
+        labels = _button_labels[locale] = _make_button_labels(locale)
+    return labels
+
+
+def precompute_button_labels() -> None:
+    for locale in i18n.available_locales:
+        get_button_labels(locale)
+    logger.debug("Button labels are precomputed for %s.", list(_button_labels))
@@ -1,3 +1,10 @@
 # flake8: noqa
-from .choices import FILTER_CHOICES_GETTERS, FilterChoice, get_filter_choice
+from .choices import (
+    FILTER_CHOICES_GETTERS,
+    FilterChoice,
+    get_filter_choice,
+    get_filter_choices,
+    get_memoized_choices,
+)
 from .filters_dict import ProductFilters
+from .registry import UnknownFilterSet, filter_sets, resolve_filters_param
@@ -1,14 +1,26 @@
+import asyncio
 import logging
 import operator
 from functools import partial
-from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from babel.support import LazyProxy
 
 from .. import callback_forms
 from ..bot import settings  # type: ignore
+from ..caching import LRUCache, StaleWhileRevalidateCache
 from ..client import Client
-from ..utils import simple_repr
+from ..utils import get_current_locale, simple_repr
 from . import constant_choices
 
 logger = logging.getLogger(__name__)
@@ -41,21 +53,43 @@ class FilterChoice:
 
 RawChoices = Sequence[Dict[str, Any]]
 
+filter_choices_cache = StaleWhileRevalidateCache(
+    "choices", **settings.FILTER_CHOICES_CACHE
+)
+
+
+async def fetch_filter_choices(
+    api_endpoint: str, locale: Optional[str] = None
+) -> RawChoices:
+    client = Client.get_client(locale)
+    return await filter_choices_cache.get(
+        f"{client.locale}:{api_endpoint}",
+        partial(client.fetch_filter_choices, api_endpoint),
+    )
+
+
+async def get_raw_choices(filter_name: str) -> RawChoices:
+    api_endpoint = settings.PRODUCT_FILTERS[filter_name].api_endpoint
+    if api_endpoint is not None:
+        choices = await fetch_filter_choices(api_endpoint)
+        logger.debug("Choices cache info: %s", filter_choices_cache)
+    else:
+        choices = getattr(constant_choices, f"{filter_name}_choices".upper())
+    return choices
+
 
 async def get_choices(
     filter_name: str,
     label_fields: Tuple[str],
     handler: Optional[Callable[..., RawChoices]] = None,
     relation_value: Optional[Any] = None,
+    raw_choices: Optional[RawChoices] = None,
     **kwargs: Any,
 ) -> Sequence[FilterChoice]:
-    api_endpoint = settings.PRODUCT_FILTERS[filter_name].api_endpoint
-    if api_endpoint is not None:
-        client = Client.get_client()
-        choices = await client.fetch_filter_choices(api_endpoint)
-        logger.debug("Choices cache info: %s", client.fetch_filter_choices.cache_info())
+    if raw_choices is not None:
+        choices = raw_choices
     else:
-        choices = getattr(constant_choices, f"{filter_name}_choices".upper())
+        choices = await get_raw_choices(filter_name)
 
     if handler is not None:
         choices = handler(choices, relation_value)
@@ -98,10 +132,74 @@ FILTER_CHOICES_GETTERS = {
 }
 
 
-async def get_filter_choice(filter_name: str, filter_id: Hashable) -> FilterChoice:
-    get_choices = FILTER_CHOICES_GETTERS[filter_name]
-    for choice in await get_choices():
-        if choice.id == filter_id:
-            return choice
+class MemoizedChoices(NamedTuple):
+    raw_choices: RawChoices
+    choices: Sequence[FilterChoice]
 
-    raise ValueError(f"Can't get filter choice for {filter_name} with id {filter_id}.")
+
+# Keyed by filter name, relation value and locale
+_memoized_choices: LRUCache[MemoizedChoices] = LRUCache(
+    "filter_choices", max_weight=settings.FILTER_STEPS_CACHE_SIZE
+)
+
+
+async def get_memoized_choices(
+    filter_name: str, relation_value: Optional[Any] = None
+) -> Sequence[FilterChoice]:
+    """Return the same choices the getter does, built once until refreshed.
+
+    The choices are rebuilt only when the cache gives new raw choices, i.e.
+    when they are refreshed, so the returned sequence is the same object until
+    then.
+    """
+    raw_choices = await get_raw_choices(filter_name)
+    memo_key = (filter_name, relation_value, get_current_locale())
+    memo = _memoized_choices.get(memo_key)
+    if memo is None or memo.raw_choices is not raw_choices:
+        choices = await FILTER_CHOICES_GETTERS[filter_name](
+            relation_value=relation_value, raw_choices=raw_choices
+        )
+        memo = MemoizedChoices(raw_choices, tuple(choices))
+        _memoized_choices.set(memo_key, memo)
+    return memo.choices
+
+
+class FilterChoicesIndex(NamedTuple):
+    choices: Sequence[FilterChoice]
+    by_id: Dict[str, FilterChoice]
+
+
+_choices_indexes: Dict[Tuple[str, str], FilterChoicesIndex] = {}
+
+
+async def get_choices_index(filter_name: str) -> Dict[str, FilterChoice]:
+    # The index is rebuilt along with the memoized choices
+    choices = await get_memoized_choices(filter_name)
+    index_key = (filter_name, get_current_locale())
+    index = _choices_indexes.get(index_key)
+    if index is None or index.choices is not choices:
+        index = FilterChoicesIndex(choices, {choice.id: choice for choice in choices})
+        _choices_indexes[index_key] = index
+    return index.by_id
+
+
+async def get_filter_choice(filter_name: str, filter_id: Hashable) -> FilterChoice:
+    return (await get_filter_choices({filter_name: filter_id}))[filter_name]
+
+
+async def get_filter_choices(
+    filters: Mapping[str, Hashable]
+) -> Dict[str, FilterChoice]:
+    """Return the choices of all the filters, looked up at once."""
+    filter_names = list(filters)
+    indexes = await asyncio.gather(*map(get_choices_index, filter_names))
+    filter_choices = {}
+    for filter_name, index in zip(filter_names, indexes):
+        filter_id = filters[filter_name]
+        try:
+            filter_choices[filter_name] = index[str(filter_id)]
+        except KeyError:
+            raise ValueError(
+                f"Can't get filter choice for {filter_name} with id {filter_id}."
+            ) from None
+    return filter_choices
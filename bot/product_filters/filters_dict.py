@@ -3,7 +3,7 @@ from collections import UserDict
 from typing import Dict, Optional, Union
 from urllib.parse import parse_qsl, urlencode
 
-from .choices import FilterChoice, get_filter_choice
+from .choices import FilterChoice, get_filter_choices
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +30,32 @@ class ProductFilters(UserDict):
     def as_query_string(self) -> str:
         return urlencode(self.data)
 
+    def as_canonical_query_string(self) -> str:
+        # The same filters set gives the same string regardless of the order,
+        # the first page is the same with or without the page number
+        return urlencode(
+            sorted(
+                (key, str(value))
+                for key, value in self.data.items()
+                if not (key == "page" and str(value) == "1")
+            )
+        )
+
+    def as_filter_set_key(self) -> str:
+        # Only the filters regardless of the order, the page doesn't matter
+        return urlencode(
+            sorted(
+                (key, str(value))
+                for key, value in self.data.items()
+                if key not in self.NOT_FILTERS
+            )
+        )
+
     async def get_with_associated_choices(self) -> Dict[str, FilterChoice]:
-        return {
-            filter_name: await get_filter_choice(filter_name, query_value)
-            for filter_name, query_value in self.data.items()
-            if filter_name not in self.NOT_FILTERS
-        }
+        return await get_filter_choices(
+            {
+                filter_name: query_value
+                for filter_name, query_value in self.data.items()
+                if filter_name not in self.NOT_FILTERS
+            }
+        )
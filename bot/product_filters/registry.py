@@ -0,0 +1,110 @@
+import base64
+import hashlib
+import logging
+from typing import Dict
+
+from ..bot import settings  # type: ignore
+from ..caching import REDIS_ERRORS, LRUCache, get_redis, make_key
+from .filters_dict import ProductFilters
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownFilterSet(Exception):
+    pass
+
+
+class FilterSetRegistry:
+    """Short content-addressed ids of filter sets, to refer to them in callbacks.
+
+    An id is derived from the canonical query string of the filters, so it's
+    known without asking Redis. Ids are stored in Redis to be resolved by any
+    bot process later and are kept in process memory both ways.
+    """
+
+    ID_BYTES = 8
+
+    def __init__(self, namespace: str, *, ttl: int, cache_size: int) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        # Known ids are forgotten well before they expire in Redis, so they are
+        # stored again and don't expire while they're in use
+        self._ids: LRUCache[str] = LRUCache(
+            f"{namespace}_ids", max_weight=cache_size, ttl=ttl / 2
+        )
+        self._filter_sets: LRUCache[ProductFilters] = LRUCache(
+            namespace, max_weight=cache_size, ttl=ttl / 2
+        )
+        # Ids made since the last save, by their canonical query strings
+        self._unsaved: Dict[str, str] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._filter_sets!r})"
+
+    def make_id(self, product_filters: ProductFilters) -> str:
+        canonical_query = product_filters.as_canonical_query_string()
+        filter_set_id = self._ids.get(canonical_query)
+        if filter_set_id is None:
+            digest = hashlib.blake2b(
+                canonical_query.encode(), digest_size=self.ID_BYTES
+            ).digest()
+            filter_set_id = base64.urlsafe_b64encode(digest).decode().rstrip("=")
+            self._remember(filter_set_id, canonical_query)
+            self._unsaved[filter_set_id] = canonical_query
+        return filter_set_id
+
+    async def save(self) -> None:
+        """Store the ids made since the last save in one round trip."""
+        if not self._unsaved:
+            return
+
+        unsaved, self._unsaved = self._unsaved, {}
+        try:
+            redis = await get_redis()
+            transaction = redis.multi_exec()
+            for filter_set_id, canonical_query in unsaved.items():
+                transaction.set(
+                    self._make_key(filter_set_id), canonical_query, expire=self.ttl
+                )
+            await transaction.execute()
+        except REDIS_ERRORS:
+            # They are still resolved by this process, and retried on next save
+            logger.warning("Unable to store filter sets.", exc_info=True)
+            self._unsaved = {**unsaved, **self._unsaved}
+
+    async def resolve(self, filter_set_id: str) -> ProductFilters:
+        product_filters = self._filter_sets.get(filter_set_id)
+        if product_filters is None:
+            try:
+                redis = await get_redis()
+                canonical_query = await redis.get(
+                    self._make_key(filter_set_id), encoding="utf-8"
+                )
+            except REDIS_ERRORS:
+                logger.warning("Unable to resolve filter set.", exc_info=True)
+                canonical_query = None
+            if canonical_query is None:
+                raise UnknownFilterSet(filter_set_id)
+
+            product_filters = self._remember(filter_set_id, canonical_query)
+        # A copy, since callers may change their filters
+        return ProductFilters(dict(product_filters))
+
+    def _remember(self, filter_set_id: str, canonical_query: str) -> ProductFilters:
+        product_filters = ProductFilters(canonical_query)
+        self._ids.set(canonical_query, filter_set_id)
+        self._filter_sets.set(filter_set_id, product_filters)
+        return product_filters
+
+    def _make_key(self, filter_set_id: str) -> str:
+        return make_key(self.namespace, filter_set_id)
+
+
+filter_sets = FilterSetRegistry("filter_sets", **settings.FILTER_SETS)
+
+
+async def resolve_filters_param(value: str) -> ProductFilters:
+    # Callbacks of messages sent before filter sets had ids carry query strings
+    if not value or "=" in value:
+        return ProductFilters(value)
+    return await filter_sets.resolve(value)
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitBreakerOpen(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Fails calls fast after `failure_threshold` consecutive failures.
+
+    After `recovery_timeout` seconds one trial call is let through, its success
+    closes the circuit and its failure keeps it open for another timeout.
+    """
+
+    def __init__(
+        self, name: str, *, failure_threshold: int, recovery_timeout: float
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    def __repr__(self) -> str:
+        class_name = type(self).__name__
+        return (
+            f"{class_name}({self.name}, state={self.state}, failures={self.failures})"
+        )
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return "half-open"
+        return "open"
+
+    def check(self) -> None:
+        state = self.state
+        if state == "open":
+            raise CircuitBreakerOpen(f"Circuit '{self.name}' is open.")
+        if state == "half-open":
+            # Let a single trial call through, the rest wait for its result
+            self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("Circuit '%s' is closed.", self.name)
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is None and self.failures >= self.failure_threshold:
+            logger.warning("Circuit '%s' is open.", self.name)
+            self.opened_at = time.monotonic()
+        elif self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+async def retry(
+    func: Callable[[], Awaitable[T]],
+    *,
+    retry_on: Tuple[Type[BaseException], ...],
+    attempts: int,
+    base_delay: float,
+    max_delay: float,
+    deadline: float,
+) -> T:
+    # Exponential backoff with full jitter, no attempt starts after the deadline
+    started_at = time.monotonic()
+    for attempt in range(1, attempts + 1):
+        try:
+            return await func()
+        except retry_on as e:
+            delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+            elapsed = time.monotonic() - started_at
+            if attempt == attempts or elapsed + delay > deadline:
+                raise e
+
+            logger.warning(
+                "Attempt %s failed with %r, retrying in %.2f seconds.",
+                attempt,
+                e,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    raise AssertionError("Unreachable, the last attempt either returns or raises.")
@@ -0,0 +1,160 @@
+import inspect
+import logging
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from aiogram import Dispatcher, types
+from aiogram.dispatcher.filters import StateFilter
+from aiogram.dispatcher.filters.state import any_state
+
+from .bot import dp  # type: ignore
+from .callback_forms import CallbackForm
+
+logger = logging.getLogger(__name__)
+
+ParamHandler = Optional[Callable[[str], Any]]
+
+
+class Route(NamedTuple):
+    handler: Callable[..., Awaitable[Any]]
+    param_handlers: Tuple[ParamHandler, ...]
+    state_filter: StateFilter
+    accepts_any_kwargs: bool
+    arg_names: FrozenSet[str]
+
+
+class _Node:
+    __slots__ = ("children", "route")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node] = {}
+        self.route: Optional[Route] = None
+
+
+class CallbackRouter:
+    """Dispatches callback queries by the parts of their callback forms.
+
+    Routes are kept in a trie of form parts, so a callback is matched in one
+    lookup however many routes there are, instead of trying a regexp filter
+    per handler. The parameters following the form are handled the same way
+    as by ``utils.handle_regex_params``, and a ``ValueError`` of a parameter
+    handler means that the callback doesn't match.
+    """
+
+    DELIMITER = CallbackForm.DELIMITER
+
+    def __init__(self, dispatcher: Dispatcher) -> None:
+        self.dispatcher = dispatcher
+        self._root = _Node()
+        self.routes_count = 0
+        dispatcher.register_callback_query_handler(
+            self._dispatch, self._check, state=any_state
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(routes={self.routes_count})"
+
+    def route(self, form: CallbackForm, *param_handlers: ParamHandler, state=any_state):
+        def decorator(func: Callable[..., Awaitable[Any]]):
+            self.add_route(form, func, *param_handlers, state=state)
+            return func
+
+        return decorator
+
+    def add_route(
+        self,
+        form: CallbackForm,
+        handler: Callable[..., Awaitable[Any]],
+        *param_handlers: ParamHandler,
+        state=any_state,
+    ) -> None:
+        node = self._root
+        for part in form.parts:
+            node = node.children.setdefault(part, _Node())
+        if node.route is not None:
+            raise ValueError(f"Callback form {form} is already routed.")
+
+        spec = inspect.getfullargspec(inspect.unwrap(handler))
+        node.route = Route(
+            handler,
+            param_handlers,
+            StateFilter(self.dispatcher, state),
+            spec.varkw is not None,
+            frozenset(spec.args + spec.kwonlyargs),
+        )
+        self.routes_count += 1
+
+    def match(self, callback_data: str) -> Optional[Tuple[Route, List[str]]]:
+        parts = callback_data.split(self.DELIMITER)
+        node = self._root
+        for depth, part in enumerate(parts, 1):
+            node = node.children.get(part)  # type: ignore
+            if node is None:
+                return None
+
+            route = node.route
+            if route is not None:
+                params_count = len(route.param_handlers)
+                values = parts[depth:]
+                if not params_count and not values:
+                    return route, values
+                if params_count and len(values) >= params_count:
+                    # The last parameter takes the rest of the data
+                    last = params_count - 1
+                    return route, [*values[:last], self.DELIMITER.join(values[last:])]
+        return None
+
+    async def _check(
+        self, callback_query: types.CallbackQuery
+    ) -> Union[bool, Dict[str, Any]]:
+        match = self.match(callback_query.data or "")
+        if match is None:
+            return False
+
+        route, values = match
+        state_data = await route.state_filter.check(callback_query)
+        if not state_data:
+            return False
+
+        try:
+            handled_params = [
+                await self._handle_param(param_handler, value)
+                for param_handler, value in zip(route.param_handlers, values)
+            ]
+        except ValueError:
+            logger.debug("Wrong callback parameters: %s", values, exc_info=True)
+            return False
+        logger.debug("Handled params: %s", handled_params)
+        return {**state_data, "route": route, "handled_params": handled_params}
+
+    @staticmethod
+    async def _handle_param(param_handler: ParamHandler, value: str) -> Any:
+        if param_handler is None:
+            return value
+        handled_value = param_handler(value)
+        # Handlers may need to look values up, e.g. in Redis
+        if inspect.isawaitable(handled_value):
+            return await handled_value
+        return handled_value
+
+    async def _dispatch(
+        self, callback_query: types.CallbackQuery, *, route: Route, **kwargs
+    ) -> Any:
+        if not route.accepts_any_kwargs:
+            kwargs = {
+                name: value for name, value in kwargs.items() if name in route.arg_names
+            }
+        return await route.handler(callback_query, **kwargs)
+
+
+callback_router = CallbackRouter(dp)
@@ -1,9 +1,13 @@
-from typing import Any, Callable, Dict, Type
+import logging
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Set, Type
 
-from marshmallow import Schema, fields, post_load
+from marshmallow import RAISE, Schema, ValidationError, fields, post_load
 from typing_extensions import Protocol
 
-from .dataclasses import Picture, Product, ProductPage, Size, StockItem
+from .dataclasses import LazyResults, Picture, Product, ProductPage, Size, StockItem
+
+logger = logging.getLogger(__name__)
 
 
 class Dataclass(Protocol):
@@ -15,6 +19,7 @@ def get_dataclass_maker(cls: Type[Dataclass]) -> Callable[..., Dataclass]:
     def make_dataclass(self, data: Dict[str, Any], **kwargs: Any) -> Dataclass:
         return cls(**data)
 
+    make_dataclass.dataclass = cls  # type: ignore
     return make_dataclass
 
 
@@ -63,12 +68,194 @@ class ProductSchema(Schema):
     make_product = post_load(get_dataclass_maker(Product))
 
 
+class LazyNested(fields.Field):
+    """List of nested objects, each one is loaded when it's indexed."""
+
+    default_error_messages = {"invalid": "Not a valid list."}
+
+    def __init__(self, schema_class: Type[Schema], **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.schema_class = schema_class
+
+    def make_results(self, raw_items: List[Any]) -> LazyResults:
+        return LazyResults(raw_items, partial(load_with_fast_path, self.schema_class))
+
+    def _deserialize(self, value: Any, attr: Any, data: Any, **kwargs: Any) -> Any:
+        if not isinstance(value, list):
+            raise self.make_error("invalid")
+        return self.make_results(value)
+
+
 class ProductPageSchema(Schema):
     count = fields.Int(required=True)
     page = fields.Int(required=True)
     num_pages = fields.Int(required=True, data_key="numPages")
     has_previous_page = fields.Bool(required=True, data_key="hasPrevious")
     has_next_page = fields.Bool(required=True, data_key="hasNext")
-    results = fields.List(fields.Nested(ProductSchema), required=True)
+    results = LazyNested(ProductSchema, required=True)
 
     make_product_page = post_load(get_dataclass_maker(ProductPage))
+
+
+class FastPathMiss(Exception):
+    pass
+
+
+# Exact types only, anything marshmallow would have to coerce misses the fast path
+_FIELD_TYPES = [(fields.Bool, "bool"), (fields.Int, "int"), (fields.Str, "str")]
+
+
+def _get_dataclass(schema_class: Type[Schema]) -> Type[Dataclass]:
+    # Hooks made by `get_dataclass_maker` know their dataclass
+    for cls in schema_class.__mro__:
+        for attr in vars(cls).values():
+            dataclass = getattr(attr, "dataclass", None)
+            if dataclass is not None:
+                return dataclass
+    raise TypeError(f"{schema_class.__name__} doesn't make a dataclass.")
+
+
+def _compile_many(loader: Callable[[Any], Any]) -> Callable[[Any], List[Any]]:
+    def load_many(values: Any) -> List[Any]:
+        if type(values) is not list:
+            raise FastPathMiss()
+        return [loader(value) for value in values]
+
+    return load_many
+
+
+def _compile_field(field: fields.Field, namespace: Dict[str, Any]) -> str:
+    """Add what the field needs to the namespace and return its checking code.
+
+    The code checks and converts `value` in place or raises `FastPathMiss`.
+    """
+    if isinstance(field, LazyNested):
+        name = f"make_{field.name}"
+        namespace[name] = field.make_results
+        return (
+            f"if type(value) is not list: raise FastPathMiss()\nvalue = {name}(value)"
+        )
+    elif isinstance(field, fields.Nested):
+        loader = compile_loader(type(field.schema))
+        if field.many:
+            loader = _compile_many(loader)
+    elif isinstance(field, fields.List):
+        inner_namespace: Dict[str, Any] = {}
+        inner_code = _compile_field(field.inner, inner_namespace)
+        loader = _compile_many(_make_function(inner_code, inner_namespace))
+    else:
+        for field_class, type_name in _FIELD_TYPES:
+            if isinstance(field, field_class):
+                break
+        else:
+            raise TypeError(f"There is no fast path for {type(field).__name__}.")
+
+        code = [f"if type(value) is not {type_name}: raise FastPathMiss()"]
+        for index, validator in enumerate(field.validators):
+            name = f"validate_{field.name}_{index}"
+            namespace[name] = validator
+            code.append(f"if {name}(value) is False: raise FastPathMiss()")
+        return "\n".join(code)
+
+    name = f"load_{field.name}"
+    namespace[name] = loader
+    return f"value = {name}(value)"
+
+
+def _make_function(value_code: str, namespace: Dict[str, Any]) -> Callable:
+    namespace["FastPathMiss"] = FastPathMiss
+    body = "\n".join(f"    {line}" for line in value_code.splitlines())
+    exec(f"def load(value):\n{body}\n    return value", namespace)
+    return namespace["load"]
+
+
+def compile_loader(schema_class: Type[Schema]) -> Callable[[Any], Any]:
+    """Compile a loader for exactly the shape the schema describes.
+
+    The loader makes the same objects as the schema, but it's plain generated
+    code without marshmallow machinery. Input of any other shape raises
+    `FastPathMiss`, and should be loaded by the schema itself.
+    """
+    schema = schema_class()
+    if schema.unknown != RAISE:
+        raise TypeError("Only schemas raising on unknown fields can be compiled.")
+
+    namespace: Dict[str, Any] = {
+        "FastPathMiss": FastPathMiss,
+        "make": _get_dataclass(schema_class),
+    }
+    lines = []
+    arguments = []
+    load_fields = [field for field in schema.fields.values() if not field.dump_only]
+    for index, field in enumerate(load_fields):
+        if not field.required:
+            raise TypeError("Only schemas of required fields can be compiled.")
+
+        field_code = _compile_field(field, namespace).splitlines()
+        lines.append(f"value = data[{field.data_key or field.name!r}]")
+        if field.allow_none:
+            lines.append("if value is not None:")
+            lines.extend(f"    {line}" for line in field_code)
+        else:
+            lines.extend(field_code)
+        lines.append(f"value_{index} = value")
+        arguments.append(f"{field.attribute or field.name}=value_{index}")
+
+    body = "\n".join(f"        {line}" for line in lines)
+    source = (
+        "def load(data):\n"
+        # All the fields are required and no unknown fields are allowed
+        f"    if type(data) is not dict or len(data) != {len(load_fields)}:\n"
+        "        raise FastPathMiss()\n"
+        "    try:\n"
+        f"{body}\n"
+        "    except KeyError:\n"
+        "        raise FastPathMiss()\n"
+        f"    return make({', '.join(arguments)})\n"
+    )
+    exec(source, namespace)
+    return namespace["load"]
+
+
+def _miss_fast_path(data: Any) -> Any:
+    raise FastPathMiss()
+
+
+@lru_cache(maxsize=None)
+def get_schema(schema_class: Type[Schema]) -> Schema:
+    return schema_class()
+
+
+_fast_loaders: Dict[Type[Schema], Callable[[Any], Any]] = {}
+
+_checked_loaders: Set[Type[Schema]] = set()
+
+
+def load_with_fast_path(schema_class: Type[Schema], data: Dict[str, Any]) -> Any:
+    try:
+        loader = _fast_loaders[schema_class]
+    except KeyError:
+        loader = _fast_loaders[schema_class] = compile_loader(schema_class)
+
+    try:
+        loaded = loader(data)
+    except (FastPathMiss, ValidationError):
+        # Let marshmallow coerce what it can or raise its errors
+        logger.debug("%s misses the fast path.", schema_class.__name__)
+        return get_schema(schema_class).load(data)
+
+    if schema_class not in _checked_loaders:
+        # The loader mirrors how marshmallow loads fields, so its first result
+        # is checked against the schema in case marshmallow behaves otherwise
+        _checked_loaders.add(schema_class)
+        expected = get_schema(schema_class).load(data)
+        if loaded != expected:
+            logger.error("Compiled %s loader is disabled.", schema_class.__name__)
+            _fast_loaders[schema_class] = _miss_fast_path
+            return expected
+    return loaded
+
+
+def deserialize_product_page(raw_page: Dict[str, Any]) -> ProductPage:
+    # Products are deserialized one by one when a slide needs them
+    return load_with_fast_path(ProductPageSchema, raw_page)
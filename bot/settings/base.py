@@ -26,9 +26,127 @@ API_BASE_URL = furl(BASE_URL).add(path=env("API_PATH")).url
 
 API_TOKEN = env("API_TOKEN")
 
+# Only idempotent requests are retried. Seconds
+API_RETRY = {
+    "attempts": env.int("API_RETRY_ATTEMPTS", 3),
+    "base_delay": 0.1,
+    "max_delay": 1,
+    "deadline": env.float("API_RETRY_DEADLINE", 5),
+}
+
+# Consecutive failures to open an endpoint circuit and seconds to try it again
+API_CIRCUIT_BREAKER = {
+    "failure_threshold": env.int("API_CIRCUIT_BREAKER_THRESHOLD", 5),
+    "recovery_timeout": env.float("API_CIRCUIT_BREAKER_TIMEOUT", 30),
+}
+
+# Shared by the API clients of all locales
+API_CONNECTOR = {
+    "limit": env.int("API_CONNECTIONS_LIMIT", 100),
+    "limit_per_host": env.int("API_CONNECTIONS_LIMIT_PER_HOST", 0),
+    "keepalive_timeout": env.float("API_KEEPALIVE_TIMEOUT", 30),
+    "use_dns_cache": True,
+    "ttl_dns_cache": env.int("API_DNS_CACHE_TTL", 300),
+}
+
+# aiohttp.ClientTimeout keyword arguments per API endpoint
+API_TIMEOUTS = {
+    "default": {"total": 10, "connect": 3},
+    "filter_choices": {"total": 10, "connect": 3, "sock_read": 5},
+    "product_page": {"total": 8, "connect": 3, "sock_read": 5},
+    "order": {"total": 20, "connect": 5},
+}
+
 PAYMENTS_PROVIDER_TOKEN = env("PAYMENTS_PROVIDER_TOKEN")
 
-FSM_STORAGE = {"host": env("STORAGE_HOST"), "port": env.int("STORAGE_PORT")}
+# Seconds. Browsing data expires before the state, so Redis can evict it first
+# when it runs out of memory (see docker/redis-cache/redis.conf)
+FSM_STORAGE = {
+    "host": env("STORAGE_HOST"),
+    "port": env.int("STORAGE_PORT"),
+    "state_ttl": env.int("FSM_STATE_TTL", 7 * 24 * 60 * 60),
+    "data_ttl": env.int("FSM_DATA_TTL", 2 * 24 * 60 * 60),
+    "bucket_ttl": env.int("FSM_BUCKET_TTL", 60 * 60),
+}
+
+# Bytes. FSM data only keeps the chosen filters, so the cap is a guard against
+# data written before pages were shared, which drops the whole page it holds
+FSM_DATA_MAX_BYTES = env.int("FSM_DATA_MAX_BYTES", 16 * 1024)
+
+# Number of Redis keys sampled by the /memory admin command
+MEMORY_REPORT_SAMPLE = env.int("MEMORY_REPORT_SAMPLE", 1000)
+
+# FSM state and data of an update are loaded once and saved in one round trip
+FSM_UNIT_OF_WORK = env.bool("FSM_UNIT_OF_WORK", True)
+
+# FSM values kept in process memory by chat and user, off if `max_weight` (bytes)
+# is 0. Values set by other bot processes are seen once the cached ones expire in
+# `ttl` seconds, so keep it short when running several of them
+FSM_LOCAL_CACHE = {
+    "max_weight": env.int("FSM_LOCAL_CACHE_MAX_BYTES", 0),
+    "ttl": env.float("FSM_LOCAL_CACHE_TTL", 2),
+}
+
+# "orjson" or "json", by default orjson if it's installed and stdlib json if not
+JSON_CODEC = env("JSON_CODEC", None)
+
+# Encoding of FSM data and cached pages in Redis, "msgpack" or "json". Values of
+# `compress_threshold` bytes or more are compressed
+STORAGE_SERIALIZER = {
+    "format": env("STORAGE_SERIALIZER_FORMAT", "msgpack"),
+    "compress_threshold": env.int("STORAGE_COMPRESS_THRESHOLD", 1024),
+    "compress_level": 6,
+}
+
+# Shared caches use the FSM storage Redis with their own pool and keys prefix
+CACHE_REDIS_POOL = {"minsize": 1, "maxsize": 10}
+
+CACHE_KEY_PREFIX = "cache"
+
+# Seconds. Choices are refreshed in background `refresh_ahead` seconds before
+# they expire and served stale for up to `max_stale` seconds if refresh lags
+FILTER_CHOICES_CACHE = {
+    "ttl": env.int("FILTER_CHOICES_CACHE_TTL", 15 * 60),
+    "refresh_ahead": env.int("FILTER_CHOICES_CACHE_REFRESH_AHEAD", 60),
+    "max_stale": env.int("FILTER_CHOICES_CACHE_MAX_STALE", 24 * 60 * 60),
+}
+
+# Pages are shared by all users, callbacks refer to them by filter set ids. Stale
+# pages are served only when the API is unavailable. Sizes in bytes
+PRODUCT_PAGE_CACHE = {
+    "ttl": env.int("PRODUCT_PAGE_CACHE_TTL", 5 * 60),
+    "max_stale": env.int("PRODUCT_PAGE_CACHE_MAX_STALE", 60 * 60),
+    "max_bytes": env.int("PRODUCT_PAGE_CACHE_MAX_BYTES", 8 * 1024 * 1024),
+    "max_page_bytes": env.int("PRODUCT_PAGE_CACHE_MAX_PAGE_BYTES", 256 * 1024),
+}
+
+# Parsed pages kept in process memory. The weight of a page is its size in Redis
+# in bytes, compressed pages take many times more memory once they're parsed
+PARSED_PAGES_CACHE = {
+    "max_weight": env.int("PARSED_PAGES_CACHE_MAX_WEIGHT", 1024 * 1024),
+    "ttl": PRODUCT_PAGE_CACHE["ttl"],
+}
+
+# Filter sets are referred to in callbacks by ids, which are kept for about
+# `ttl` seconds since they were last used, then buttons referring to them expire
+FILTER_SETS = {
+    "ttl": env.int("FILTER_SETS_TTL", 30 * 24 * 60 * 60),
+    "cache_size": env.int("FILTER_SETS_CACHE_SIZE", 4096),
+}
+
+# Number of filter steps (filter, relation value and locale) kept with their
+# choices and keyboards built
+FILTER_STEPS_CACHE_SIZE = env.int("FILTER_STEPS_CACHE_SIZE", 256)
+
+# Rendered product captions kept in process memory, filter choices labels in
+# them are refreshed along with the choices
+CAPTION_CACHE = {
+    "max_weight": env.int("CAPTION_CACHE_MAX_SIZE", 5000),
+    "ttl": FILTER_CHOICES_CACHE["ttl"],
+}
+
+# Seconds to warm up the caches of all locales before polling starts
+WARM_UP_TIMEOUT = env.float("WARM_UP_TIMEOUT", 30)
 
 TIMEZONE = env("TIMEZONE", "UTC")
 
@@ -38,10 +156,14 @@ SHORT_DATETIME_FORMAT = "%d/%m/%Y %H:%M"
 
 FILTERS_STORAGE_KEY = "filters"
 
+# Product pages were kept in FSM data under this key before they were shared
 CACHED_PAGE_STORAGE_KEY = "cached_page"
 
 PRODUCT_PAGE_SIZE = 10
 
+# Number of slides to a page edge when the adjacent page starts to be prefetched
+PRODUCT_PAGE_PREFETCH_THRESHOLD = 3
+
 _ = lambda s: s  # noqa
 
 
@@ -0,0 +1,43 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+
+    @property
+    def total(self) -> float:
+        return sum(seconds for __, seconds in self.stages)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages.append((name, seconds))
+
+    def record_since_start(self, name: str) -> None:
+        # Time since the timer creation which isn't covered by other stages
+        self.record(name, time.perf_counter() - self.started_at - self.total)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at)
+
+    def report(self) -> str:
+        lines = [f"{name}: {seconds:.3f}s" for name, seconds in self.stages]
+        lines.append(f"total: {self.total:.3f}s")
+        return "; ".join(lines)
+
+    def log_report(self) -> None:
+        logger.info("Startup timing: %s", self.report())
+
+
+# Created on the package import, so the imports are timed too
+startup_timer = StartupTimer()
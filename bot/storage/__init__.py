@@ -0,0 +1,4 @@
+# flake8: noqa
+from .redis import SerializingRedisStorage
+from .serializers import Serializer
+from .unit_of_work import UnitOfWork, UnitOfWorkMiddleware
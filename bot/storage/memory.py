@@ -0,0 +1,124 @@
+"""Report Redis memory used by key type, sampling keys with SCAN and MEMORY USAGE.
+
+Types are FSM key types (state, data and bucket) and cache namespaces:
+
+    python -m bot.storage.memory --sample 2000
+"""
+import argparse
+import asyncio
+from typing import Dict, List, NamedTuple
+
+import aioredis
+
+from .redis import KEY_TYPES, SerializingRedisStorage
+
+SCAN_COUNT = 200
+
+
+class KeyTypeUsage(NamedTuple):
+    keys: int
+    bytes: int
+
+
+class MemoryReport(NamedTuple):
+    used_memory: int
+    maxmemory: int
+    policy: str
+    total_keys: int
+    sampled_keys: int
+    usages: Dict[str, KeyTypeUsage]
+
+    def estimate_bytes(self, usage: KeyTypeUsage) -> int:
+        """Estimate the memory used by all keys of the type."""
+        if not self.sampled_keys:
+            return 0
+        return usage.bytes * self.total_keys // self.sampled_keys
+
+
+def get_key_type(key: str, fsm_prefix: str, cache_prefix: str) -> str:
+    prefix, *parts = key.split(":")
+    if prefix == fsm_prefix and parts and parts[-1] in KEY_TYPES:
+        return f"{prefix}:{parts[-1]}"
+    if prefix == cache_prefix and parts:
+        return f"{prefix}:{parts[0]}"
+    return "other"
+
+
+async def sample_memory_usage(
+    redis: aioredis.Redis, fsm_prefix: str, cache_prefix: str, sample_size: int
+) -> MemoryReport:
+    usages: Dict[str, KeyTypeUsage] = {}
+    sampled_keys = 0
+    cursor = b"0"
+    while sampled_keys < sample_size:
+        cursor, keys = await redis.scan(cursor, count=SCAN_COUNT)
+        keys = keys[: sample_size - sampled_keys]
+        # Commands of a connection are pipelined, so it's a round trip per batch
+        key_sizes = await asyncio.gather(
+            *[redis.execute(b"MEMORY", b"USAGE", key) for key in keys]
+        )
+        for key, key_size in zip(keys, key_sizes):
+            if key_size is None:
+                # Expired meanwhile
+                continue
+            key_type = get_key_type(key.decode(), fsm_prefix, cache_prefix)
+            usage = usages.get(key_type, KeyTypeUsage(0, 0))
+            usages[key_type] = KeyTypeUsage(usage.keys + 1, usage.bytes + key_size)
+            sampled_keys += 1
+        if cursor in (0, b"0"):
+            break
+
+    info = (await redis.info("memory"))["memory"]
+    return MemoryReport(
+        used_memory=int(info["used_memory"]),
+        maxmemory=int(info["maxmemory"]),
+        policy=info["maxmemory_policy"],
+        total_keys=await redis.dbsize(),
+        sampled_keys=sampled_keys,
+        usages=usages,
+    )
+
+
+async def report_storage_memory_usage(
+    storage: SerializingRedisStorage, cache_prefix: str, sample_size: int
+) -> MemoryReport:
+    redis = await storage.redis()
+    fsm_prefix = storage.generate_key()
+    return await sample_memory_usage(redis, fsm_prefix, cache_prefix, sample_size)
+
+
+def format_memory_report(report: MemoryReport) -> str:
+    lines: List[str] = [
+        f"Used {report.used_memory // 1024} KiB of "
+        f"{report.maxmemory // 1024 or '-'} KiB, {report.policy}",
+        f"Sampled {report.sampled_keys} of {report.total_keys} keys",
+        "",
+        f"{'type':<24} {'keys':>6} {'avg, B':>7} {'est., KiB':>10}",
+    ]
+    usages = sorted(report.usages.items(), key=lambda item: -item[1].bytes)
+    for key_type, usage in usages:
+        lines.append(
+            f"{key_type:<24} {usage.keys:>6} {usage.bytes // usage.keys:>7}"
+            f" {report.estimate_bytes(usage) // 1024:>10}"
+        )
+    return "\n".join(lines)
+
+
+async def main() -> None:
+    from ..bot import dp, settings  # type: ignore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sample", type=int, default=settings.MEMORY_REPORT_SAMPLE)
+    args = parser.parse_args()
+    try:
+        report = await report_storage_memory_usage(
+            dp.storage, settings.CACHE_KEY_PREFIX, args.sample
+        )
+        print(format_memory_report(report))
+    finally:
+        await dp.storage.close()
+        await dp.storage.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,68 @@
+"""Rewrite FSM data and buckets stored as plain JSON in the serializer format.
+
+Storage migrates values lazily when they are set, this migrates all of them at
+once, keeping their TTLs:
+
+    python -m bot.storage.migrate
+"""
+import asyncio
+import logging
+from typing import Tuple
+
+from aiogram.contrib.fsm_storage.redis import STATE_BUCKET_KEY, STATE_DATA_KEY
+
+from .redis import SerializingRedisStorage
+
+logger = logging.getLogger(__name__)
+
+# Swaps the value only if it's unchanged since it was read, keeping the TTL
+REPLACE_SCRIPT = """
+if redis.call("GET", KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+local ttl = redis.call("PTTL", KEYS[1])
+redis.call("SET", KEYS[1], ARGV[2])
+if ttl > 0 then
+    redis.call("PEXPIRE", KEYS[1], ttl)
+end
+return 1
+"""
+
+
+async def migrate_legacy_values(storage: SerializingRedisStorage) -> Tuple[int, int]:
+    """Return the numbers of migrated and already migrated values."""
+    redis = await storage.redis()
+    serializer = storage.serializer
+    migrated = skipped = 0
+    suffixes = tuple(f":{key_type}" for key_type in (STATE_DATA_KEY, STATE_BUCKET_KEY))
+    async for key in redis.iscan(match=storage.generate_key("*")):
+        if not key.decode().endswith(suffixes):
+            continue
+
+        raw_value = await redis.get(key)
+        if not raw_value or not serializer.is_legacy(raw_value):
+            skipped += 1
+            continue
+
+        value = serializer.dumps(serializer.loads(raw_value))
+        if await redis.eval(REPLACE_SCRIPT, keys=[key], args=[raw_value, value]):
+            migrated += 1
+        else:
+            # Changed meanwhile, so it's already written by the storage
+            skipped += 1
+    return migrated, skipped
+
+
+async def main() -> None:
+    from ..bot import dp  # type: ignore
+
+    try:
+        migrated, skipped = await migrate_legacy_values(dp.storage)
+        logger.info("Migrated %s values, skipped %s.", migrated, skipped)
+    finally:
+        await dp.storage.close()
+        await dp.storage.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(main())
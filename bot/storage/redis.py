@@ -0,0 +1,286 @@
+import logging
+from typing import TYPE_CHECKING, Any, AnyStr, Dict, Optional, Sequence, Tuple, Union
+
+from aiogram.contrib.fsm_storage.redis import (
+    STATE_BUCKET_KEY,
+    STATE_DATA_KEY,
+    STATE_KEY,
+    RedisStorage2,
+)
+
+from .serializers import Serializer
+from .unit_of_work import RawValue, UnitOfWork, current_unit_of_work
+
+if TYPE_CHECKING:
+    from ..caching import LRUCache
+
+Address = Union[str, int, None]
+
+logger = logging.getLogger(__name__)
+
+KEY_TYPES = (STATE_KEY, STATE_DATA_KEY, STATE_BUCKET_KEY)
+
+# Buckets are always read and written in Redis right away, since throttling of
+# concurrent updates relies on them
+BATCHED_KEY_TYPES = (STATE_KEY, STATE_DATA_KEY)
+
+
+class SerializingRedisStorage(RedisStorage2):
+    """Redis FSM storage encoding data and buckets with a serializer.
+
+    Values stored as plain JSON are still read, and they are rewritten in the
+    serializer format the next time they are set.
+
+    Within a unit of work (see `UnitOfWorkMiddleware`) the state and data of an
+    address are read in one round trip, and their changes are saved in another
+    one when the work is done or flushed.
+
+    FSM data over `max_data_bytes` loses its `expendable_data_keys` in their
+    order until it fits.
+
+    With `local_cache` options the values of recently used addresses are also
+    kept in process memory for `ttl` seconds. Writes of this process go through
+    the cache, writes of other processes are seen once the values expire.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        serializer: Serializer,
+        local_cache: Optional[Dict[str, Any]] = None,
+        max_data_bytes: int = 0,
+        expendable_data_keys: Sequence[str] = (),
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.serializer = serializer
+        self.max_data_bytes = max_data_bytes
+        self.expendable_data_keys = expendable_data_keys
+        self.round_trips = 0
+        self.local_cache: Optional[LRUCache[Dict[str, RawValue]]] = None
+        if local_cache and local_cache["max_weight"]:
+            # Caches use the settings of the bot, which creates the storage
+            from ..caching import LRUCache
+
+            self.local_cache = LRUCache("fsm_storage", **local_cache)
+
+    async def get_state(
+        self,
+        *,
+        chat: Address = None,
+        user: Address = None,
+        default: Optional[str] = None,
+    ) -> Optional[str]:
+        raw_state = await self._get_raw_value(chat, user, STATE_KEY)
+        return raw_state.decode() if raw_state else None
+
+    async def set_state(
+        self,
+        *,
+        chat: Address = None,
+        user: Address = None,
+        state: Optional[AnyStr] = None,
+    ) -> None:
+        raw_state = state.encode() if isinstance(state, str) else state
+        await self._set_raw_value(chat, user, STATE_KEY, raw_state, self._state_ttl)
+
+    async def get_data(
+        self,
+        *,
+        chat: Address = None,
+        user: Address = None,
+        default: Optional[Dict] = None,
+    ) -> Dict:
+        return await self._get_value(chat, user, STATE_DATA_KEY, default)
+
+    async def set_data(
+        self, *, chat: Address = None, user: Address = None, data: Dict = None
+    ) -> None:
+        raw_data = self._dump_data(data)
+        await self._set_raw_value(chat, user, STATE_DATA_KEY, raw_data, self._data_ttl)
+
+    async def get_bucket(
+        self,
+        *,
+        chat: Address = None,
+        user: Address = None,
+        default: Optional[Dict] = None,
+    ) -> Dict:
+        return await self._get_value(chat, user, STATE_BUCKET_KEY, default)
+
+    async def set_bucket(
+        self, *, chat: Address = None, user: Address = None, bucket: Dict = None
+    ) -> None:
+        await self._set_value(chat, user, STATE_BUCKET_KEY, bucket, self._bucket_ttl)
+
+    async def flush_unit_of_work(self) -> None:
+        """Save the changes of the current unit of work made so far.
+
+        Concurrent updates of the chat see them, e.g. while the update is
+        answered.
+        """
+        unit_of_work = self._get_unit_of_work()
+        if unit_of_work is not None:
+            await self._save_changes(unit_of_work, unit_of_work.pop_changes())
+
+    async def save_unit_of_work(self, unit_of_work: UnitOfWork) -> None:
+        await self._save_changes(unit_of_work, unit_of_work.finish())
+
+    async def _save_changes(
+        self,
+        unit_of_work: UnitOfWork,
+        changes: Dict[str, Tuple[RawValue, Optional[int]]],
+    ) -> None:
+        if not changes:
+            return
+
+        redis = await self.redis()
+        transaction = redis.multi_exec()
+        for key, (raw_value, expire) in changes.items():
+            if raw_value is None:
+                transaction.delete(key)
+            else:
+                transaction.set(key, raw_value, expire=expire)
+        self._count_round_trip(unit_of_work)
+        await transaction.execute()
+        self._write_through(
+            {key: raw_value for key, (raw_value, __) in changes.items()}
+        )
+
+    def _dump_data(self, data: Optional[Dict]) -> bytes:
+        raw_data = self.serializer.dumps(data)
+        if not self.max_data_bytes or not data:
+            return raw_data
+
+        for key in self.expendable_data_keys:
+            if len(raw_data) <= self.max_data_bytes:
+                break
+            if key in data:
+                logger.info(
+                    "Dropping '%s' of FSM data of %s bytes.", key, len(raw_data)
+                )
+                data = {name: value for name, value in data.items() if name != key}
+                raw_data = self.serializer.dumps(data)
+
+        if len(raw_data) > self.max_data_bytes:
+            logger.warning("FSM data of %s bytes is over the cap.", len(raw_data))
+        return raw_data
+
+    async def _get_value(
+        self, chat: Address, user: Address, key_type: str, default: Optional[Dict]
+    ) -> Dict:
+        raw_value = await self._get_raw_value(chat, user, key_type)
+        if raw_value:
+            return self.serializer.loads(raw_value)
+        return default or {}
+
+    async def _set_value(
+        self,
+        chat: Address,
+        user: Address,
+        key_type: str,
+        value: Optional[Dict],
+        expire: Optional[int],
+    ) -> None:
+        raw_value = self.serializer.dumps(value)
+        await self._set_raw_value(chat, user, key_type, raw_value, expire)
+
+    async def _get_raw_value(
+        self, chat: Address, user: Address, key_type: str
+    ) -> RawValue:
+        chat, user = self.check_address(chat=chat, user=user)
+        key = self.generate_key(chat, user, key_type)
+        unit_of_work = self._get_unit_of_work(key_type)
+        if unit_of_work is not None:
+            address = self.generate_key(chat, user)
+            if not unit_of_work.is_loaded(address):
+                values = await self._load_values(chat, user, unit_of_work)
+                unit_of_work.load(address, values)
+            return unit_of_work.get(key)
+
+        if self.local_cache is not None and key_type in BATCHED_KEY_TYPES:
+            return (await self._load_values(chat, user))[key]
+
+        redis = await self.redis()
+        self._count_round_trip()
+        return await redis.get(key)
+
+    async def _set_raw_value(
+        self,
+        chat: Address,
+        user: Address,
+        key_type: str,
+        raw_value: RawValue,
+        expire: Optional[int],
+    ) -> None:
+        chat, user = self.check_address(chat=chat, user=user)
+        key = self.generate_key(chat, user, key_type)
+        unit_of_work = self._get_unit_of_work(key_type)
+        if unit_of_work is not None:
+            unit_of_work.set(key, raw_value, expire)
+            return
+
+        redis = await self.redis()
+        self._count_round_trip()
+        if raw_value is None:
+            await redis.delete(key)
+        else:
+            await redis.set(key, raw_value, expire=expire)
+        self._write_through({key: raw_value})
+
+    async def _load_values(
+        self, chat: Address, user: Address, unit_of_work: Optional[UnitOfWork] = None
+    ) -> Dict[str, RawValue]:
+        """Return the values of all key types of the address by their keys."""
+        address = self.generate_key(chat, user)
+        if self.local_cache is not None:
+            values = self.local_cache.get(address)
+            if values is not None:
+                return values
+
+        keys = [
+            self.generate_key(chat, user, key_type) for key_type in BATCHED_KEY_TYPES
+        ]
+        redis = await self.redis()
+        self._count_round_trip(unit_of_work)
+        values = dict(zip(keys, await redis.mget(*keys)))
+        self._cache_locally(address, values)
+        return values
+
+    def _write_through(self, changes: Dict[str, RawValue]) -> None:
+        if self.local_cache is None:
+            return
+
+        for key, raw_value in changes.items():
+            address, __ = key.rsplit(":", 1)
+            values = self.local_cache.get(address)
+            # Values of an address are cached all together, so the entry keeps its
+            # age, otherwise writes of this process would keep values changed by
+            # other ones from expiring
+            if values is not None:
+                values = {**values, key: raw_value}
+                self.local_cache.replace(address, values, self._get_weight(values))
+
+    def _cache_locally(self, address: str, values: Dict[str, RawValue]) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set(address, values, self._get_weight(values))
+
+    @staticmethod
+    def _get_weight(values: Dict[str, RawValue]) -> int:
+        return sum(len(raw_value) for raw_value in values.values() if raw_value) or 1
+
+    @staticmethod
+    def _get_unit_of_work(key_type: str = STATE_KEY) -> Optional[UnitOfWork]:
+        unit_of_work = current_unit_of_work.get()
+        if (
+            unit_of_work is None
+            or unit_of_work.done
+            or key_type not in BATCHED_KEY_TYPES
+        ):
+            return None
+        return unit_of_work
+
+    def _count_round_trip(self, unit_of_work: Optional[UnitOfWork] = None) -> None:
+        self.round_trips += 1
+        if unit_of_work is not None:
+            unit_of_work.round_trips += 1
@@ -0,0 +1,84 @@
+import logging
+import zlib
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+from ..json_codec import STDLIB_CODEC, JsonCodec
+
+logger = logging.getLogger(__name__)
+
+# The first byte of an encoded value, no JSON document starts with these bytes,
+# so values written before the header was introduced are told apart
+JSON_FORMAT = 0x01
+MSGPACK_FORMAT = 0x02
+COMPRESSED = 0x80
+
+FORMATS = {"json": JSON_FORMAT, "msgpack": MSGPACK_FORMAT}
+
+HEADERS = {header | flag for header in FORMATS.values() for flag in (0, COMPRESSED)}
+
+
+class Serializer:
+    """Encodes values to bytes prefixed with a header byte of their format.
+
+    Values of ``compress_threshold`` bytes or more are zlib compressed if it
+    makes them smaller. Values in any known format and plain JSON without
+    header are decoded regardless of the format used to encode.
+    """
+
+    def __init__(
+        self,
+        format: str = "msgpack",
+        compress_threshold: int = 1024,
+        compress_level: int = zlib.Z_DEFAULT_COMPRESSION,
+        json_codec: JsonCodec = STDLIB_CODEC,
+    ) -> None:
+        if format == "msgpack" and msgpack is None:
+            logger.warning("msgpack isn't installed, values are encoded as JSON.")
+            format = "json"
+
+        self.format = FORMATS[format]
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.json_codec = json_codec
+
+    def __repr__(self) -> str:
+        format_name = next(name for name, fmt in FORMATS.items() if fmt == self.format)
+        return f"{type(self).__name__}({format_name})"
+
+    def dumps(self, value: Any) -> bytes:
+        header = self.format
+        if header == MSGPACK_FORMAT:
+            encoded = msgpack.packb(value, use_bin_type=True)
+        else:
+            encoded = self.json_codec.dumps_bytes(value)
+
+        if len(encoded) >= self.compress_threshold:
+            compressed = zlib.compress(encoded, self.compress_level)
+            if len(compressed) < len(encoded):
+                encoded, header = compressed, header | COMPRESSED
+
+        return bytes((header,)) + encoded
+
+    def loads(self, raw: bytes) -> Any:
+        if self.is_legacy(raw):
+            return self.json_codec.loads(raw)
+
+        header, encoded = raw[0], raw[1:]
+        if header & COMPRESSED:
+            encoded = zlib.decompress(encoded)
+
+        if header & ~COMPRESSED == MSGPACK_FORMAT:
+            if msgpack is None:
+                raise ValueError("msgpack is required to decode the value.")
+            return msgpack.unpackb(encoded, raw=False)
+        return self.json_codec.loads(encoded)
+
+    @staticmethod
+    def is_legacy(raw: bytes) -> bool:
+        # Plain JSON written before values got the header
+        return raw[0] not in HEADERS
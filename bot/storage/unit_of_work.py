@@ -0,0 +1,92 @@
+import logging
+from contextvars import ContextVar
+from typing import Dict, Optional, Set, Tuple
+
+from aiogram import types
+from aiogram.dispatcher.middlewares import BaseMiddleware
+
+logger = logging.getLogger(__name__)
+
+RawValue = Optional[bytes]
+
+
+class UnitOfWork:
+    """Storage values of one update, loaded and saved in a round trip each.
+
+    Values are kept serialized, so callers get their own copies of them as they
+    do from Redis. The last value set for a key is saved when the work is done.
+    """
+
+    def __init__(self) -> None:
+        self.round_trips = 0
+        # Tasks started by the update share its context, they can't use the
+        # unit once it's saved
+        self.done = False
+        self._values: Dict[str, RawValue] = {}
+        self._changes: Dict[str, Tuple[RawValue, Optional[int]]] = {}
+        # Addresses whose keys are loaded
+        self._loaded: Set[str] = set()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(values={len(self._values)}, "
+            f"changes={len(self._changes)}, round_trips={self.round_trips})"
+        )
+
+    def is_loaded(self, address: str) -> bool:
+        return address in self._loaded
+
+    def load(self, address: str, values: Dict[str, RawValue]) -> None:
+        self._loaded.add(address)
+        for key, raw_value in values.items():
+            # Values set before the load are newer
+            self._values.setdefault(key, raw_value)
+
+    def get(self, key: str) -> RawValue:
+        return self._values.get(key)
+
+    def set(self, key: str, raw_value: RawValue, expire: Optional[int]) -> None:
+        self._values[key] = raw_value
+        self._changes[key] = (raw_value, expire)
+
+    def pop_changes(self) -> Dict[str, Tuple[RawValue, Optional[int]]]:
+        changes, self._changes = self._changes, {}
+        return changes
+
+    def finish(self) -> Dict[str, Tuple[RawValue, Optional[int]]]:
+        """Return the changes left to save."""
+        self.done = True
+        return self.pop_changes()
+
+
+current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """Makes each update a unit of work of the FSM storage.
+
+    The storage must support units of work, like `SerializingRedisStorage`.
+    Changes of an update are seen by concurrent updates of the same chat only
+    once they're saved, and the update that saves last wins. So handlers flush
+    them (`flush_unit_of_work`) before answering, which takes the most time.
+    """
+
+    async def on_pre_process_update(self, update: types.Update, data: dict) -> None:
+        current_unit_of_work.set(UnitOfWork())
+
+    async def on_post_process_update(
+        self, update: types.Update, results: list, data: dict
+    ) -> None:
+        unit_of_work = current_unit_of_work.get()
+        if unit_of_work is None:
+            return
+
+        current_unit_of_work.set(None)
+        await self.manager.dispatcher.storage.save_unit_of_work(unit_of_work)
+        logger.debug(
+            "Update %s took %s storage round trips.",
+            update.update_id,
+            unit_of_work.round_trips,
+        )
@@ -1,5 +1,6 @@
 import base64
 import functools
+import inspect
 import logging
 from datetime import datetime
 from functools import partial
@@ -7,7 +8,7 @@ from typing import Any, Awaitable, Callable, Optional, Sequence, Type, TypeVar
 
 import pytz
 
-from .bot import settings  # type: ignore
+from .bot import i18n, settings  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,14 @@ def simple_repr(cls: Type[T]) -> Type[T]:
     return cls
 
 
+def get_current_locale(locale: Optional[str] = None) -> str:
+    if locale is None:
+        locale = i18n.ctx_locale.get()
+    if locale not in i18n.available_locales:
+        return i18n.default
+    return locale
+
+
 def is_admin(user_id: int):
     return user_id in settings.ADMINS
 
@@ -65,6 +74,10 @@ def handle_regex_params(
                 type_(captured_value) if type_ is not None else captured_value
                 for type_, captured_value in handle_groups
             ]
+            # Handlers may need to look values up, e.g. in Redis
+            for index, value in enumerate(handled_params):
+                if inspect.isawaitable(value):
+                    handled_params[index] = await value
             logger.debug("Handled params: %s", handled_params)
             return await func(*args, handled_params=handled_params, **kwargs)
 
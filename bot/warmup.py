@@ -0,0 +1,38 @@
+import asyncio
+import logging
+
+from .bot import i18n, settings  # type: ignore
+from .product_answers.getters import prefetch_product_page
+from .product_answers.labels import precompute_button_labels
+from .product_filters import ProductFilters
+from .product_filters.choices import fetch_filter_choices
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_locale(locale: str) -> None:
+    api_endpoints = {
+        filter_settings.api_endpoint
+        for filter_settings in settings.PRODUCT_FILTERS.values()
+        if filter_settings.api_endpoint is not None
+    }
+    results = await asyncio.gather(
+        *[fetch_filter_choices(api_endpoint, locale) for api_endpoint in api_endpoints],
+        prefetch_product_page(locale, ProductFilters()),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Unable to warm up '%s' locale cache: %r", locale, result)
+
+
+async def warm_up() -> None:
+    precompute_button_labels()
+    # A dead API must not keep the bot from starting, users just get cold caches
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*map(warm_up_locale, i18n.available_locales)),
+            timeout=settings.WARM_UP_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        logger.error("Caches warm up timed out.")
@@ -0,0 +1,3 @@
+# flake8: noqa
+from .app import FaultSettings, make_app
+from .catalog import Catalog, make_catalog
@@ -0,0 +1,38 @@
+import argparse
+import logging
+
+from aiohttp import web
+
+from .app import FaultSettings, make_app
+from .catalog import make_catalog
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Stand-in shop API serving a synthetic catalog."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--prefix", default="/api", help="API path, see API_PATH")
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0..1")
+    parser.add_argument("--error-status", type=int, default=503)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    base_url = f"http://{args.host}:{args.port}/"
+    catalog = make_catalog(args.products, base_url=base_url, seed=args.seed)
+    faults = FaultSettings(
+        args.latency, args.latency_jitter, args.error_rate, args.error_status
+    )
+    web.run_app(make_app(catalog, faults, args.prefix), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+from aiohttp import web
+
+from .catalog import Catalog, make_page
+
+logger = logging.getLogger(__name__)
+
+FILTER_PARAMS = ["category", "season", "brand", "color", "outer_material"]
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+@dataclass
+class FaultSettings:
+    # Seconds of latency added to every response and its random spread
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Share of requests answered with `error_status`
+    error_rate: float = 0.0
+    error_status: int = 503
+
+
+def _json_response(request: web.Request, data: Any, status: int = 200) -> web.Response:
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+    if status == 200 and request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers={"ETag": etag})
+
+    return web.Response(
+        body=body,
+        status=status,
+        content_type="application/json",
+        headers={"ETag": etag} if status == 200 else None,
+    )
+
+
+@web.middleware
+async def faults_middleware(request: web.Request, handler: Handler):
+    faults: FaultSettings = request.app["faults"]
+    request.app["stats"][request.path] = request.app["stats"].get(request.path, 0) + 1
+    if request.path.endswith("/_control/"):
+        return await handler(request)
+
+    delay = faults.latency + random.uniform(0, faults.latency_jitter)
+    if delay:
+        await asyncio.sleep(delay)
+    if random.random() < faults.error_rate:
+        return web.json_response(
+            {"detail": "Injected error."}, status=faults.error_status
+        )
+    return await handler(request)
+
+
+async def list_products(request: web.Request) -> web.Response:
+    catalog: Catalog = request.app["catalog"]
+    try:
+        page = int(request.query.get("page", 1))
+        page_size = int(request.query.get("page_size", 10))
+    except ValueError:
+        return _json_response(request, {"detail": "Invalid page."}, status=404)
+
+    filters = {
+        name: request.query[name] for name in FILTER_PARAMS if name in request.query
+    }
+    products_page = make_page(catalog.filter_products(filters), page, page_size)
+    if products_page is None:
+        return _json_response(request, {"detail": "Invalid page."}, status=404)
+    return _json_response(request, products_page)
+
+
+def make_list_handler(name: str) -> Handler:
+    async def list_records(request: web.Request) -> web.Response:
+        return _json_response(request, getattr(request.app["catalog"], name))
+
+    return list_records
+
+
+async def create_order(request: web.Request) -> web.Response:
+    order = await request.json()
+    product_ids = {product["id"] for product in request.app["catalog"].products}
+    items = order.get("items") or []
+    errors: Dict[str, Any] = {}
+    if not items or any(item.get("shoes") not in product_ids for item in items):
+        errors["items"] = ["Invalid shoes."]
+    for field in ["full_name", "mobile_number", "shipping_type"]:
+        if not order.get(field):
+            errors[field] = ["This field is required."]
+    if errors:
+        return _json_response(request, errors, status=400)
+
+    request.app["orders"].append(order)
+    return _json_response(
+        request, {"id": len(request.app["orders"]), **order}, status=201
+    )
+
+
+async def control(request: web.Request) -> web.Response:
+    # Lets a load test change the injected faults and read request counters
+    faults: FaultSettings = request.app["faults"]
+    if request.method == "POST":
+        for name, value in (await request.json()).items():
+            setattr(faults, name, type(getattr(faults, name))(value))
+        logger.info("Faults are changed: %s", faults)
+    return web.json_response({"faults": asdict(faults), "stats": request.app["stats"]})
+
+
+def make_app(
+    catalog: Catalog, faults: FaultSettings = None, prefix: str = "/api"
+) -> web.Application:
+    app = web.Application(middlewares=[faults_middleware])
+    app["catalog"] = catalog
+    app["faults"] = faults or FaultSettings()
+    app["stats"] = {}
+    app["orders"] = []
+
+    app.router.add_get(f"{prefix}/shoes/", list_products)
+    for name in ["categories", "brands", "colors", "outer_materials"]:
+        app.router.add_get(f"{prefix}/{name}/", make_list_handler(name))
+    app.router.add_post(f"{prefix}/order/", create_order)
+    app.router.add_route("*", f"{prefix}/_control/", control)
+    return app
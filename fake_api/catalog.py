@@ -0,0 +1,161 @@
+import random
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+GENDERS = ["Women", "Men", "Kids"]
+SUBCATEGORIES = ["Boots", "Sneakers", "Sandals", "Loafers", "Slippers", "Heels"]
+SEASONS = ["winter", "spring", "summer", "fall"]
+BRANDS = ["Aldo", "Clarks", "Ecco", "Geox", "Lasocki", "Rieker", "Tamaris", "Vagabond"]
+COLORS = ["Black", "White", "Brown", "Red", "Blue", "Beige", "Grey", "Green"]
+MATERIALS = ["Leather", "Suede", "Textile", "Nubuck", "Synthetic"]
+SOLES = ["Rubber", "TPR", "Leather", None]
+SIZES = list(range(35, 47))
+
+Record = Dict[str, Any]
+
+
+class Catalog(NamedTuple):
+    base_url: str
+    categories: List[Record]
+    brands: List[Record]
+    colors: List[Record]
+    outer_materials: List[Record]
+    products: List[Record]
+
+    def filter_products(self, filters: Dict[str, str]) -> List[Record]:
+        products: Sequence[Record] = self.products
+        for name, value in filters.items():
+            if name == "category":
+                # A gender category matches all of its subcategories
+                products = [
+                    product
+                    for product in products
+                    if value in (str(product["_category"]), str(product["_gender"]))
+                ]
+            elif name == "season":
+                products = [p for p in products if p["season"] == value]
+            elif name in ("brand", "color", "outer_material"):
+                products = [p for p in products if str(p[f"_{name}"]) == value]
+        return list(products)
+
+
+def _make_named(names: Sequence[str]) -> List[Record]:
+    return [{"id": id_, "name": name} for id_, name in enumerate(names, start=1)]
+
+
+def _make_categories() -> List[Record]:
+    categories: List[Record] = [
+        {"id": id_, "title": title, "parent": None}
+        for id_, title in enumerate(GENDERS, start=1)
+    ]
+    for gender in list(categories):
+        for subcategory in SUBCATEGORIES:
+            categories.append(
+                {
+                    "id": len(categories) + 1,
+                    "title": f"{gender['title']} {subcategory.lower()}",
+                    "parent": gender["id"],
+                }
+            )
+    return categories
+
+
+def _make_picture(base_url: str, id_: int) -> Record:
+    return {
+        "id": id_,
+        "pic": f"{base_url}media/pictures/{id_}.jpg",
+        "thumbnail": f"{base_url}media/pictures/{id_}_thumbnail.jpg",
+    }
+
+
+def make_product(
+    base_url: str,
+    id_: int,
+    categories: Sequence[Record],
+    brands: Sequence[Record],
+    colors: Sequence[Record],
+    outer_materials: Sequence[Record],
+    rng: Optional[random.Random] = None,
+) -> Record:
+    rng = rng or random.Random(id_)
+    category = rng.choice([c for c in categories if c["parent"] is not None])
+    brand, color = rng.choice(brands), rng.choice(colors)
+    outer_material = rng.choice(outer_materials)
+    pictures_number = rng.randint(1, 6)
+    stock_items = [
+        {
+            "id": id_ * 100 + index,
+            "size": {"id": SIZES.index(size) + 1, "size": size},
+            "stock": rng.choice([0, 0, 1, 2, 5]),
+        }
+        for index, size in enumerate(sorted(rng.sample(SIZES, rng.randint(1, 8))))
+    ]
+    return {
+        "url": f"{base_url}shoes/{id_}/",
+        "id": id_,
+        "code": f"{brand['name'][:3].upper()}-{id_:06d}",
+        "name": f"{brand['name']} {category['title']} {id_}",
+        "brand": brand["name"],
+        "category": category["title"],
+        "season": rng.choice(SEASONS),
+        "price": str(Decimal(rng.randrange(500, 8000, 50))),
+        "price_currency": "UAH",
+        "is_new": rng.random() < 0.2,
+        "color": color["name"],
+        "inner_material": rng.choice(MATERIALS),
+        "outer_material": outer_material["name"],
+        "sole": rng.choice(SOLES),
+        "main_picture": _make_picture(base_url, id_ * 10),
+        "secondary_pictures": [
+            _make_picture(base_url, id_ * 10 + index)
+            for index in range(1, pictures_number)
+        ],
+        "stock_items": stock_items,
+        # Private ids to filter by, they aren't a part of the responses
+        "_category": category["id"],
+        "_gender": category["parent"],
+        "_brand": brand["id"],
+        "_color": color["id"],
+        "_outer_material": outer_material["id"],
+    }
+
+
+def make_catalog(
+    products_number: int, base_url: str = "http://shop.local/", seed: int = 0
+) -> Catalog:
+    rng = random.Random(seed)
+    categories = _make_categories()
+    brands, colors = _make_named(BRANDS), _make_named(COLORS)
+    outer_materials = _make_named(MATERIALS)
+    products = [
+        make_product(
+            base_url, id_, categories, brands, colors, outer_materials, rng=rng
+        )
+        for id_ in range(1, products_number + 1)
+    ]
+    return Catalog(base_url, categories, brands, colors, outer_materials, products)
+
+
+def public_product(product: Record) -> Record:
+    return {name: value for name, value in product.items() if not name.startswith("_")}
+
+
+def make_page(
+    products: Sequence[Record], page: int, page_size: int
+) -> Optional[Record]:
+    # Mirrors the shop API pagination, None means the page doesn't exist
+    count = len(products)
+    num_pages = max(1, -(-count // page_size))
+    if not 1 <= page <= num_pages:
+        return None
+
+    start = (page - 1) * page_size
+    end = start + page_size
+    return {
+        "count": count,
+        "page": page,
+        "numPages": num_pages,
+        "hasPrevious": page > 1,
+        "hasNext": page < num_pages,
+        "results": [public_product(product) for product in products[start:end]],
+    }